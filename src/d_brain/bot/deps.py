@@ -0,0 +1,90 @@
+"""Shared service instances for bot handlers.
+
+Services are built once per process and reused across updates
+instead of being reconstructed on every message or callback.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from d_brain.config import get_settings
+from d_brain.services.channel_reader import ChannelReader
+from d_brain.services.gdocs import GoogleDocsSync
+from d_brain.services.git import VaultGit
+from d_brain.services.processor import ClaudeProcessor
+from d_brain.services.session import SessionStore
+from d_brain.services.storage import VaultStorage
+
+
+class HandlerConfig(NamedTuple):
+    """Settings read by handlers at request time."""
+
+    deepgram_api_key: str
+
+
+@lru_cache(maxsize=1)
+def get_config() -> HandlerConfig:
+    """Get the settings fields used by handlers, read once."""
+    settings = get_settings()
+    return HandlerConfig(
+        deepgram_api_key=settings.deepgram_api_key,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_processor() -> ClaudeProcessor:
+    """Get the shared Claude processor."""
+    settings = get_settings()
+    return ClaudeProcessor(
+        settings.vault_path,
+        settings.ticktick_client_id,
+        settings.ticktick_client_secret,
+        settings.ticktick_access_token,
+        settings.planfix_account,
+        settings.planfix_token,
+        fast_model=settings.claude_fast_model,
+        api_key=settings.anthropic_api_key,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_git() -> VaultGit:
+    """Get the shared vault git service."""
+    return VaultGit(get_settings().vault_path)
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> VaultStorage:
+    """Get the shared vault storage."""
+    return VaultStorage(get_settings().vault_path)
+
+
+@lru_cache(maxsize=1)
+def get_session_store() -> SessionStore:
+    """Get the shared session store."""
+    return SessionStore(get_settings().vault_path)
+
+
+@lru_cache(maxsize=1)
+def get_channel_reader() -> ChannelReader | None:
+    """Get the shared channel reader, or None if no channel is configured."""
+    settings = get_settings()
+    if not settings.telegram_channel:
+        return None
+    return ChannelReader(
+        channel=settings.telegram_channel,
+        vault_path=settings.vault_path,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_gdocs() -> GoogleDocsSync | None:
+    """Get the shared Google Docs sync, or None if no folder is configured."""
+    settings = get_settings()
+    if not settings.google_docs_folder_id:
+        return None
+    return GoogleDocsSync(
+        settings.vault_path,
+        settings.google_docs_folder_id,
+        settings.google_credentials_path,
+    )
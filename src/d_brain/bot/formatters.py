@@ -2,6 +2,7 @@
 
 import html
 import re
+from html.parser import HTMLParser
 from typing import Any
 
 
@@ -97,6 +98,58 @@ def validate_telegram_html(text: str) -> bool:
     return len(tag_stack) == 0
 
 
+class _TelegramHTMLChecker(HTMLParser):
+    """Walks HTML and records whether Telegram would accept it."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.tag_stack: list[str] = []
+        self.valid = True
+
+    def handle_starttag(
+        self,
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        if tag not in ALLOWED_TAGS:
+            self.valid = False
+        self.tag_stack.append(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self.tag_stack or self.tag_stack[-1] != tag:
+            self.valid = False
+            return
+        self.tag_stack.pop()
+
+    def handle_entityref(self, name: str) -> None:
+        if name not in {"amp", "lt", "gt", "quot"}:
+            self.valid = False
+
+    def handle_data(self, data: str) -> None:
+        if "<" in data:
+            self.valid = False
+
+
+def telegram_parse_mode(text: str) -> str | None:
+    """Pick parse mode for a message before sending it.
+
+    Args:
+        text: Message text, possibly containing HTML
+
+    Returns:
+        "HTML" if Telegram can parse the markup, None to send as plain text
+    """
+    if "<" not in text and "&" not in text:
+        return "HTML"
+
+    checker = _TelegramHTMLChecker()
+    checker.feed(text)
+    checker.close()
+    if checker.valid and not checker.tag_stack and not checker.rawdata:
+        return "HTML"
+    return None
+
+
 def truncate_html(text: str, max_length: int = 4096) -> str:
     """Truncate HTML text while keeping tags balanced.
 
@@ -207,7 +260,6 @@ def split_html_report(text: str, max_length: int = 4000) -> list[str]:
         return [text]
 
     # Try to split by seed boundaries
-    import re
     parts: list[str] = []
     # Split before each <b>Seed # marker (keep the marker with the next chunk)
     chunks = re.split(r"(?=<b>Seed #)", text)
@@ -4,6 +4,9 @@ from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 
+from d_brain.bot.handlers.commands import cmd_help, cmd_status
+from d_brain.bot.handlers.process import cmd_process
+from d_brain.bot.handlers.weekly import cmd_weekly
 from d_brain.bot.inline_keyboards import content_menu_keyboard, plan_menu_keyboard
 from d_brain.bot.states import DoCommandState
 
@@ -13,24 +16,18 @@ router = Router(name="buttons")
 @router.message(F.text == "📊 Статус")
 async def btn_status(message: Message) -> None:
     """Handle Status button."""
-    from d_brain.bot.handlers.commands import cmd_status
-
     await cmd_status(message)
 
 
 @router.message(F.text == "⚙️ Обработать")
 async def btn_process(message: Message) -> None:
     """Handle Process button."""
-    from d_brain.bot.handlers.process import cmd_process
-
     await cmd_process(message)
 
 
 @router.message(F.text == "📅 Неделя")
 async def btn_weekly(message: Message) -> None:
     """Handle Weekly button."""
-    from d_brain.bot.handlers.weekly import cmd_weekly
-
     await cmd_weekly(message)
 
 
@@ -65,6 +62,4 @@ async def btn_plan(message: Message) -> None:
 @router.message(F.text == "❓ Помощь")
 async def btn_help(message: Message) -> None:
     """Handle Help button."""
-    from d_brain.bot.handlers.commands import cmd_help
-
     await cmd_help(message)
@@ -2,32 +2,26 @@
 
 import asyncio
 import logging
+import re
 from datetime import date, timedelta
+from typing import Any
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
+from d_brain.bot.deps import get_channel_reader, get_git, get_processor
 from d_brain.bot.formatters import format_process_report, split_html_report
+from d_brain.bot.handlers.content import cmd_content
+from d_brain.bot.inflight import run_coalesced
+from d_brain.bot.sending import answer_html, edit_html, send_parts
 from d_brain.bot.states import ContentSeedsState
-from d_brain.config import get_settings
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
 
 router = Router(name="callbacks")
 logger = logging.getLogger(__name__)
 
-
-def _get_processor() -> ClaudeProcessor:
-    settings = get_settings()
-    return ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
+_DISMISS_RE = re.compile(r"(?:удали|убери|удалить|убрать)\s+(.+)", re.IGNORECASE)
+_NUM_RE = re.compile(r"\d+")
 
 
 # --- Content callbacks ---
@@ -45,27 +39,26 @@ async def on_content_my_seeds(callback: CallbackQuery, state: FSMContext) -> Non
 
     status_msg = await msg.answer("⏳ Загружаю seeds и сверяю с каналом...")
 
-    settings = get_settings()
-    processor = _get_processor()
+    processor = get_processor()
 
     # Read channel posts for comparison
     channel_posts_text = ""
-    if settings.telegram_channel:
+    reader = get_channel_reader()
+    if reader:
         try:
-            from d_brain.services.channel_reader import ChannelReader
-
-            reader = ChannelReader(
-                channel=settings.telegram_channel,
-                vault_path=settings.vault_path,
-            )
             posts = await reader.get_recent_posts(limit=30)
-            channel_posts_text = reader.format_for_prompt(posts, limit=20)
+            channel_posts_text = await asyncio.to_thread(
+                reader.format_for_prompt,
+                posts,
+                limit=20,
+            )
         except Exception as e:
             logger.warning("Failed to read channel for seed matching: %s", e)
 
     # Match seeds with channel posts via Claude
-    result = await asyncio.to_thread(
-        processor.list_unpublished_seeds, channel_posts_text,
+    result = await run_coalesced(
+        processor.list_unpublished_seeds,
+        channel_posts_text,
     )
 
     if "error" in result:
@@ -83,35 +76,36 @@ async def on_content_my_seeds(callback: CallbackQuery, state: FSMContext) -> Non
         return
 
     # Build compact list
-    lines = [
-        f"🌱 <b>Неопубликованные seeds</b> ({len(unpublished)} из {total}):",
-        "",
-    ]
-    for i, s in enumerate(unpublished, 1):
-        lines.append(f"{i}. [{s['week']}] #{s['num']}: {s['title']}")
-
-    if result.get("dismissed_count"):
-        lines.append(f"🗑 Скрыто: {result['dismissed_count']}")
-    lines.append("")
-    lines.append("↩️ Номер - раскрыть seed | «удали 3,5» - скрыть")
-
-    text = "\n".join(lines)
+    seed_list = "\n".join(
+        f"{i}. [{s['week']}] #{s['num']}: {s['title']}"
+        for i, s in enumerate(unpublished, 1)
+    )
+    dismissed_line = (
+        f"\n🗑 Скрыто: {result['dismissed_count']}"
+        if result.get("dismissed_count")
+        else ""
+    )
+    text = (
+        f"🌱 <b>Неопубликованные seeds</b> ({len(unpublished)} из {total}):\n\n"
+        f"{seed_list}{dismissed_line}\n\n"
+        "↩️ Номер - раскрыть seed | «удали 3,5» - скрыть"
+    )
 
-    # Store seeds in FSM for number lookup
+    # Store seed keys in FSM for number lookup; full text is reloaded on demand
     await state.set_state(ContentSeedsState.waiting_for_number)
-    await state.update_data(seeds=unpublished)
+    await state.update_data(
+        seeds=[
+            {"week": s["week"], "num": s["num"], "title": s["title"]}
+            for s in unpublished
+        ]
+    )
 
-    try:
-        await status_msg.edit_text(text)
-    except Exception:
-        await status_msg.edit_text(text, parse_mode=None)
+    await edit_html(status_msg, text)
 
 
 @router.message(ContentSeedsState.waiting_for_number)
 async def on_seed_number(message: Message, state: FSMContext) -> None:
     """Handle seed number selection or dismiss command."""
-    import re
-
     if not message.text:
         await state.clear()
         return
@@ -121,21 +115,25 @@ async def on_seed_number(message: Message, state: FSMContext) -> None:
     seeds = data.get("seeds", [])
 
     # Check for dismiss command: "удали 3,5" / "убери 1, 4, 7"
-    dismiss_match = re.match(r"(?:удали|убери|удалить|убрать)\s+(.+)", text, re.IGNORECASE)
+    dismiss_match = _DISMISS_RE.match(text)
     if dismiss_match:
         numbers_str = dismiss_match.group(1)
-        nums = [int(n) for n in re.findall(r"\d+", numbers_str) if 1 <= int(n) <= len(seeds)]
+        nums = [
+            k for n in _NUM_RE.findall(numbers_str) if 1 <= (k := int(n)) <= len(seeds)
+        ]
         if not nums:
             await message.answer(f"❌ Введи числа от 1 до {len(seeds)}")
             return
 
         to_dismiss = [seeds[n - 1] for n in nums]
-        processor = _get_processor()
+        processor = get_processor()
         count = processor.dismiss_seeds(to_dismiss)
 
         titles = ", ".join(f"#{seeds[n - 1]['num']}" for n in nums)
         await state.clear()
-        await message.answer(f"🗑 Скрыто {count} seeds: {titles}\n\nНажми «📋 Мои seeds» чтобы обновить список.")
+        await message.answer(
+            f"🗑 Скрыто {count} seeds: {titles}\n\nНажми «📋 Мои seeds» чтобы обновить список."
+        )
         return
 
     # Try to parse a number for seed expansion
@@ -152,21 +150,28 @@ async def on_seed_number(message: Message, state: FSMContext) -> None:
     seed = seeds[num - 1]
     await state.clear()
 
+    processor = get_processor()
+    full_text = await asyncio.to_thread(
+        processor.get_seed_text,
+        seed["week"],
+        seed["num"],
+    )
+    if full_text is None:
+        await message.answer(
+            "❌ Seed не найден. Нажми «📋 Мои seeds» чтобы обновить список.",
+        )
+        return
+
     # Convert markdown to HTML for display
-    processor = _get_processor()
-    full_html = processor._markdown_to_html(seed["full_text"])
+    full_html = processor._markdown_to_html(full_text)
 
     header = f"🌱 <b>[{seed['week']}] Seed #{seed['num']}: {seed['title']}</b>\n\n"
     response = header + full_html
 
-    # Truncate if too long
-    if len(response) > 4000:
-        response = response[:3950] + "\n\n<i>...(обрезано)</i>"
-
-    try:
-        await message.answer(response)
-    except Exception:
-        await message.answer(response, parse_mode=None)
+    # Split/truncate long seeds without breaking tags
+    parts = await asyncio.to_thread(split_html_report, response)
+    for part in parts:
+        await answer_html(message, part)
 
 
 @router.callback_query(F.data == "content:new_seeds")
@@ -179,8 +184,6 @@ async def on_content_new_seeds(callback: CallbackQuery, state: FSMContext) -> No
     if not msg:
         return
 
-    from d_brain.bot.handlers.content import cmd_content
-
     await cmd_content(msg)
 
 
@@ -194,10 +197,10 @@ async def on_plan_current(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
 
     msg = callback.message
-    if not msg:
+    if not isinstance(msg, Message):
         return
 
-    processor = _get_processor()
+    processor = get_processor()
     plan_data = processor.get_current_plan()
 
     if "error" in plan_data:
@@ -211,12 +214,9 @@ async def on_plan_current(callback: CallbackQuery, state: FSMContext) -> None:
     header = f"📋 <b>Контент-план {plan_data['week']}</b>\n\n"
     response = header + plan_html
 
-    parts = split_html_report(response)
+    parts = await asyncio.to_thread(split_html_report, response)
     for part in parts:
-        try:
-            await msg.answer(part)
-        except Exception:
-            await msg.answer(part, parse_mode=None)
+        await answer_html(msg, part)
 
 
 @router.callback_query(F.data == "plan:new")
@@ -226,10 +226,10 @@ async def on_plan_new(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
 
     msg = callback.message
-    if not msg:
+    if not isinstance(msg, Message):
         return
 
-    processor = _get_processor()
+    processor = get_processor()
 
     # Smart logic: if current week has plan → generate for next week
     if processor.plan_exists_for_week(0):
@@ -247,27 +247,25 @@ async def on_plan_new(callback: CallbackQuery, state: FSMContext) -> None:
             f"⏳ Генерирую план на {week_label}...",
         )
 
-    settings = get_settings()
-    git = VaultGit(settings.vault_path)
+    git = get_git()
 
     # Read channel posts
     channel_posts_text = ""
-    if settings.telegram_channel:
+    reader = get_channel_reader()
+    if reader:
         try:
-            from d_brain.services.channel_reader import ChannelReader
-
-            reader = ChannelReader(
-                channel=settings.telegram_channel,
-                vault_path=settings.vault_path,
-            )
             posts = await reader.get_recent_posts(limit=20)
-            channel_posts_text = reader.format_for_prompt(posts, limit=15)
+            channel_posts_text = await asyncio.to_thread(
+                reader.format_for_prompt,
+                posts,
+                limit=15,
+            )
         except Exception as e:
             logger.warning("Failed to read channel: %s", e)
 
-    async def run_with_progress() -> dict:
+    async def run_with_progress() -> dict[str, Any]:
         task = asyncio.create_task(
-            asyncio.to_thread(
+            run_coalesced(
                 processor.generate_content_plan,
                 channel_posts=channel_posts_text,
                 target_date=target_date,
@@ -276,7 +274,7 @@ async def on_plan_new(callback: CallbackQuery, state: FSMContext) -> None:
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -291,24 +289,20 @@ async def on_plan_new(callback: CallbackQuery, state: FSMContext) -> None:
 
     report = await run_with_progress()
 
+    # Commit in the background while the report is being sent
+    commit_task = None
     if "error" not in report:
-        await asyncio.to_thread(
-            git.commit_and_push, f"chore: content plan {week_label}",
+        commit_task = asyncio.create_task(
+            git.commit_and_push_async(f"chore: content plan {week_label}"),
         )
 
-    formatted = format_process_report(report)
-    parts = split_html_report(formatted)
+    formatted = await asyncio.to_thread(format_process_report, report)
+    parts = await asyncio.to_thread(split_html_report, formatted)
 
-    try:
-        await status_msg.edit_text(parts[0])
-    except Exception:
-        await status_msg.edit_text(parts[0], parse_mode=None)
+    await send_parts(status_msg, msg, parts)
 
-    for part in parts[1:]:
-        try:
-            await msg.answer(part)
-        except Exception:
-            await msg.answer(part, parse_mode=None)
+    if commit_task:
+        await commit_task
 
 
 @router.callback_query(F.data == "plan:reconcile")
@@ -318,27 +312,25 @@ async def on_plan_reconcile(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
 
     msg = callback.message
-    if not msg:
+    if not isinstance(msg, Message):
         return
 
     status_msg = await msg.answer("⏳ Сверяю план с каналом...")
 
-    settings = get_settings()
-    processor = _get_processor()
-    git = VaultGit(settings.vault_path)
+    processor = get_processor()
+    git = get_git()
 
     # Read channel posts
     channel_posts_text = ""
-    if settings.telegram_channel:
+    reader = get_channel_reader()
+    if reader:
         try:
-            from d_brain.services.channel_reader import ChannelReader
-
-            reader = ChannelReader(
-                channel=settings.telegram_channel,
-                vault_path=settings.vault_path,
-            )
             posts = await reader.get_recent_posts(limit=20)
-            channel_posts_text = reader.format_for_prompt(posts, limit=15)
+            channel_posts_text = await asyncio.to_thread(
+                reader.format_for_prompt,
+                posts,
+                limit=15,
+            )
         except Exception as e:
             logger.warning("Failed to read channel: %s", e)
 
@@ -346,16 +338,17 @@ async def on_plan_reconcile(callback: CallbackQuery, state: FSMContext) -> None:
         await status_msg.edit_text("❌ Не удалось прочитать посты из канала")
         return
 
-    async def run_with_progress() -> dict:
+    async def run_with_progress() -> dict[str, Any]:
         task = asyncio.create_task(
-            asyncio.to_thread(
-                processor.reconcile_plan_with_channel, channel_posts_text,
+            run_coalesced(
+                processor.reconcile_plan_with_channel,
+                channel_posts_text,
             ),
         )
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -369,22 +362,19 @@ async def on_plan_reconcile(callback: CallbackQuery, state: FSMContext) -> None:
 
     report = await run_with_progress()
 
+    # Commit in the background while the report is being sent
+    commit_task = None
     if "error" not in report:
-        await asyncio.to_thread(
-            git.commit_and_push,
-            f"chore: reconcile plan {date.today().isoformat()}",
+        commit_task = asyncio.create_task(
+            git.commit_and_push_async(
+                f"chore: reconcile plan {date.today().isoformat()}",
+            ),
         )
 
-    formatted = format_process_report(report)
-    parts = split_html_report(formatted)
+    formatted = await asyncio.to_thread(format_process_report, report)
+    parts = await asyncio.to_thread(split_html_report, formatted)
 
-    try:
-        await status_msg.edit_text(parts[0])
-    except Exception:
-        await status_msg.edit_text(parts[0], parse_mode=None)
+    await send_parts(status_msg, msg, parts)
 
-    for part in parts[1:]:
-        try:
-            await msg.answer(part)
-        except Exception:
-            await msg.answer(part, parse_mode=None)
+    if commit_task:
+        await commit_task
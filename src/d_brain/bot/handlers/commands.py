@@ -6,10 +6,8 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_session_store, get_storage
 from d_brain.bot.keyboards import get_main_keyboard
-from d_brain.config import get_settings
-from d_brain.services.session import SessionStore
-from d_brain.services.storage import VaultStorage
 
 router = Router(name="commands")
 
@@ -63,11 +61,10 @@ async def cmd_help(message: Message) -> None:
 async def cmd_status(message: Message) -> None:
     """Handle /status command."""
     user_id = message.from_user.id if message.from_user else 0
-    settings = get_settings()
-    storage = VaultStorage(settings.vault_path)
+    storage = get_storage()
 
     # Log command
-    session = SessionStore(settings.vault_path)
+    session = get_session_store()
     session.append(user_id, "command", cmd="/status")
 
     today = date.today()
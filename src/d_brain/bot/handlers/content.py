@@ -3,16 +3,16 @@
 import asyncio
 import logging
 from datetime import date
+from typing import Any
 
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_gdocs, get_git, get_processor
 from d_brain.bot.formatters import format_process_report, split_html_report
-from d_brain.config import get_settings
-from d_brain.services.gdocs import GoogleDocsSync
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
+from d_brain.bot.inflight import run_coalesced
+from d_brain.bot.sending import send_parts
 
 router = Router(name="content")
 logger = logging.getLogger(__name__)
@@ -26,19 +26,13 @@ async def cmd_content(message: Message) -> None:
 
     status_msg = await message.answer("⏳ Генерирую content seeds...")
 
-    settings = get_settings()
-
     # Step 1: Sync Google Docs (if configured)
     sync_info = ""
-    if settings.google_docs_folder_id:
+    gdocs = get_gdocs()
+    if gdocs:
         try:
             await status_msg.edit_text("⏳ Синхронизирую транскрипты встреч...")
-            gdocs = GoogleDocsSync(
-                settings.vault_path,
-                settings.google_docs_folder_id,
-                settings.google_credentials_path,
-            )
-            sync_result = await asyncio.to_thread(gdocs.sync)
+            sync_result = await run_coalesced(gdocs.sync)
             synced = sync_result.get("synced", 0)
             if synced > 0:
                 sync_info = f"\n📥 Синхронизировано встреч: {synced}"
@@ -49,28 +43,21 @@ async def cmd_content(message: Message) -> None:
 
     # Step 2: Generate content seeds
     try:
-        await status_msg.edit_text("⏳ Генерирую content seeds... (может занять до 5 мин)")
+        await status_msg.edit_text(
+            "⏳ Генерирую content seeds... (может занять до 5 мин)"
+        )
     except Exception:
         pass
 
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
-    git = VaultGit(settings.vault_path)
-
-    async def run_with_progress() -> dict:
-        task = asyncio.create_task(
-            asyncio.to_thread(processor.generate_content_seeds)
-        )
+    processor = get_processor()
+    git = get_git()
+
+    async def run_with_progress() -> dict[str, Any]:
+        task = asyncio.create_task(run_coalesced(processor.generate_content_seeds))
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -84,29 +71,23 @@ async def cmd_content(message: Message) -> None:
 
     report = await run_with_progress()
 
-    # Step 3: Commit changes
+    # Step 3: Commit changes (in the background while the report is sent)
+    commit_task = None
     if "error" not in report:
         today = date.today().isoformat()
-        await asyncio.to_thread(
-            git.commit_and_push, f"chore: content seeds {today}"
+        commit_task = asyncio.create_task(
+            git.commit_and_push_async(f"chore: content seeds {today}"),
         )
 
     # Step 4: Send report (handle long messages)
-    formatted = format_process_report(report)
+    formatted = await asyncio.to_thread(format_process_report, report)
 
     if sync_info and "error" not in report:
         formatted = sync_info + "\n\n" + formatted
 
-    parts = split_html_report(formatted)
+    parts = await asyncio.to_thread(split_html_report, formatted)
 
-    try:
-        await status_msg.edit_text(parts[0])
-    except Exception:
-        await status_msg.edit_text(parts[0], parse_mode=None)
+    await send_parts(status_msg, message, parts)
 
-    # Send remaining parts as new messages
-    for part in parts[1:]:
-        try:
-            await message.answer(part)
-        except Exception:
-            await message.answer(part, parse_mode=None)
+    if commit_task:
+        await commit_task
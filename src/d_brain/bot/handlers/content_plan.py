@@ -3,15 +3,16 @@
 import asyncio
 import logging
 from datetime import date
+from typing import Any
 
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_channel_reader, get_git, get_processor
 from d_brain.bot.formatters import format_process_report, split_html_report
-from d_brain.config import get_settings
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
+from d_brain.bot.inflight import run_coalesced
+from d_brain.bot.sending import send_parts
 
 router = Router(name="content_plan")
 logger = logging.getLogger(__name__)
@@ -25,21 +26,18 @@ async def cmd_plan(message: Message) -> None:
 
     status_msg = await message.answer("⏳ Генерирую контент-план на неделю...")
 
-    settings = get_settings()
-
     # Step 1: Read channel posts (if configured)
     channel_posts_text = ""
-    if settings.telegram_channel:
+    reader = get_channel_reader()
+    if reader:
         try:
             await status_msg.edit_text("⏳ Читаю последние посты из канала...")
-            from d_brain.services.channel_reader import ChannelReader
-
-            reader = ChannelReader(
-                channel=settings.telegram_channel,
-                vault_path=settings.vault_path,
-            )
             posts = await reader.get_recent_posts(limit=20)
-            channel_posts_text = reader.format_for_prompt(posts, limit=15)
+            channel_posts_text = await asyncio.to_thread(
+                reader.format_for_prompt,
+                posts,
+                limit=15,
+            )
             logger.info("Loaded %d channel posts for context", len(posts))
         except Exception as e:
             logger.warning("Failed to read channel: %s", e)
@@ -47,23 +45,18 @@ async def cmd_plan(message: Message) -> None:
 
     # Step 2: Generate content plan
     try:
-        await status_msg.edit_text("⏳ Составляю контент-план... (может занять до 5 мин)")
+        await status_msg.edit_text(
+            "⏳ Составляю контент-план... (может занять до 5 мин)"
+        )
     except Exception:
         pass
 
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
-    git = VaultGit(settings.vault_path)
-
-    async def run_with_progress() -> dict:
+    processor = get_processor()
+    git = get_git()
+
+    async def run_with_progress() -> dict[str, Any]:
         task = asyncio.create_task(
-            asyncio.to_thread(
+            run_coalesced(
                 processor.generate_content_plan,
                 channel_posts=channel_posts_text,
             )
@@ -71,7 +64,7 @@ async def cmd_plan(message: Message) -> None:
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -85,24 +78,19 @@ async def cmd_plan(message: Message) -> None:
 
     report = await run_with_progress()
 
-    # Step 3: Commit
+    # Step 3: Commit (in the background while the report is sent)
+    commit_task = None
     if "error" not in report:
         today = date.today().isoformat()
-        await asyncio.to_thread(
-            git.commit_and_push, f"chore: content plan {today}"
+        commit_task = asyncio.create_task(
+            git.commit_and_push_async(f"chore: content plan {today}"),
         )
 
     # Step 4: Send report
-    formatted = format_process_report(report)
-    parts = split_html_report(formatted)
+    formatted = await asyncio.to_thread(format_process_report, report)
+    parts = await asyncio.to_thread(split_html_report, formatted)
 
-    try:
-        await status_msg.edit_text(parts[0])
-    except Exception:
-        await status_msg.edit_text(parts[0], parse_mode=None)
+    await send_parts(status_msg, message, parts)
 
-    for part in parts[1:]:
-        try:
-            await message.answer(part)
-        except Exception:
-            await message.answer(part, parse_mode=None)
+    if commit_task:
+        await commit_task
@@ -8,10 +8,10 @@ from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_config, get_processor
 from d_brain.bot.formatters import format_process_report
+from d_brain.bot.sending import edit_html
 from d_brain.bot.states import DoCommandState
-from d_brain.config import get_settings
-from d_brain.services.processor import ClaudeProcessor
 from d_brain.services.transcription import DeepgramTranscriber
 
 router = Router(name="do")
@@ -46,8 +46,7 @@ async def handle_do_input(message: Message, bot: Bot, state: FSMContext) -> None
     # Handle voice input
     if message.voice:
         await message.chat.do(action="typing")
-        settings = get_settings()
-        transcriber = DeepgramTranscriber(settings.deepgram_api_key)
+        transcriber = DeepgramTranscriber(get_config().deepgram_api_key)
 
         try:
             file = await bot.get_file(message.voice.file_id)
@@ -90,15 +89,7 @@ async def process_request(message: Message, prompt: str, user_id: int = 0) -> No
     """Process the user's request with Claude."""
     status_msg = await message.answer("⏳ Выполняю...")
 
-    settings = get_settings()
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
+    processor = get_processor()
 
     async def run_with_progress() -> dict:
         task = asyncio.create_task(
@@ -107,7 +98,7 @@ async def process_request(message: Message, prompt: str, user_id: int = 0) -> No
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -122,8 +113,4 @@ async def process_request(message: Message, prompt: str, user_id: int = 0) -> No
     report = await run_with_progress()
 
     formatted = format_process_report(report)
-    try:
-        await status_msg.edit_text(formatted)
-    except Exception:
-        # Fallback: send without HTML parsing
-        await status_msg.edit_text(formatted, parse_mode=None)
+    await edit_html(status_msg, formatted)
@@ -1,14 +1,11 @@
 """Forwarded message handler."""
 
 import logging
-from datetime import datetime
 
 from aiogram import Router
 from aiogram.types import Message
 
-from d_brain.config import get_settings
-from d_brain.services.session import SessionStore
-from d_brain.services.storage import VaultStorage
+from d_brain.bot.deps import get_session_store, get_storage
 
 router = Router(name="forward")
 logger = logging.getLogger(__name__)
@@ -20,8 +17,7 @@ async def handle_forward(message: Message) -> None:
     if not message.from_user:
         return
 
-    settings = get_settings()
-    storage = VaultStorage(settings.vault_path)
+    storage = get_storage()
 
     # Determine source name
     source_name = "Unknown"
@@ -41,11 +37,11 @@ async def handle_forward(message: Message) -> None:
     content = message.text or message.caption or "[media]"
     msg_type = f"[forward from: {source_name}]"
 
-    timestamp = datetime.fromtimestamp(message.date.timestamp())
+    timestamp = message.date.astimezone()
     storage.append_to_daily(content, timestamp, msg_type)
 
     # Log to session
-    session = SessionStore(settings.vault_path)
+    session = get_session_store()
     session.append(
         message.from_user.id,
         "forward",
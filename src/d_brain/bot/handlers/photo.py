@@ -1,14 +1,11 @@
 """Photo message handler."""
 
 import logging
-from datetime import datetime
 
 from aiogram import Bot, Router
 from aiogram.types import Message
 
-from d_brain.config import get_settings
-from d_brain.services.session import SessionStore
-from d_brain.services.storage import VaultStorage
+from d_brain.bot.deps import get_session_store, get_storage
 
 router = Router(name="photo")
 logger = logging.getLogger(__name__)
@@ -20,8 +17,7 @@ async def handle_photo(message: Message, bot: Bot) -> None:
     if not message.photo or not message.from_user:
         return
 
-    settings = get_settings()
-    storage = VaultStorage(settings.vault_path)
+    storage = get_storage()
 
     # Get largest photo
     photo = message.photo[-1]
@@ -37,7 +33,7 @@ async def handle_photo(message: Message, bot: Bot) -> None:
             await message.answer("Failed to download photo")
             return
 
-        timestamp = datetime.fromtimestamp(message.date.timestamp())
+        timestamp = message.date.astimezone()
         photo_bytes = file_bytes.read()
 
         # Determine extension from file path
@@ -61,7 +57,7 @@ async def handle_photo(message: Message, bot: Bot) -> None:
         storage.append_to_daily(content, timestamp, "[photo]")
 
         # Log to session
-        session = SessionStore(settings.vault_path)
+        session = get_session_store()
         session.append(
             message.from_user.id,
             "photo",
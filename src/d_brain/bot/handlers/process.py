@@ -8,10 +8,9 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_git, get_processor
 from d_brain.bot.formatters import format_process_report
-from d_brain.config import get_settings
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
+from d_brain.bot.sending import edit_html
 
 router = Router(name="process")
 logger = logging.getLogger(__name__)
@@ -25,16 +24,8 @@ async def cmd_process(message: Message) -> None:
 
     status_msg = await message.answer("⏳ Processing... (may take up to 10 min)")
 
-    settings = get_settings()
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
-    git = VaultGit(settings.vault_path)
+    processor = get_processor()
+    git = get_git()
 
     # Run subprocess in thread to avoid blocking event loop
     async def process_with_progress() -> dict:
@@ -44,7 +35,7 @@ async def cmd_process(message: Message) -> None:
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -61,12 +52,8 @@ async def cmd_process(message: Message) -> None:
     # Commit and push changes
     if "error" not in report:
         today = date.today().isoformat()
-        await asyncio.to_thread(git.commit_and_push, f"chore: process daily {today}")
+        await git.commit_and_push_async(f"chore: process daily {today}")
 
     # Format and send report
     formatted = format_process_report(report)
-    try:
-        await status_msg.edit_text(formatted)
-    except Exception:
-        # Fallback: send without HTML parsing
-        await status_msg.edit_text(formatted, parse_mode=None)
+    await edit_html(status_msg, formatted)
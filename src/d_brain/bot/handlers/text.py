@@ -2,58 +2,62 @@
 
 import asyncio
 import logging
-from datetime import date, datetime
+import re
+from datetime import date
+from enum import IntEnum
 
 from aiogram import Router
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_git, get_processor, get_session_store, get_storage
 from d_brain.bot.formatters import format_process_report, split_html_report
-from d_brain.config import get_settings
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
-from d_brain.services.session import SessionStore
-from d_brain.services.storage import VaultStorage
+from d_brain.bot.handlers.do import process_request
+from d_brain.bot.sending import send_parts
 
 router = Router(name="text")
 logger = logging.getLogger(__name__)
 
-
-def _is_reply_to_bot(message: Message) -> bool:
-    """Check if user is replying to a bot message."""
-    if not message.reply_to_message:
-        return False
+PLAN_MARKERS = (
+    "контент-план",
+    "Контент-план",
+    "Content Plan",
+    "Якорный пост",
+    "якорный пост",
+    "TELEGRAM:",
+    "LINKEDIN:",
+    "Пн:",
+    "Вт:",
+    "Ср:",
+    "Чт:",
+    "Пт:",
+)
+_PLAN_MARKER_RE = re.compile("|".join(re.escape(m) for m in PLAN_MARKERS))
+
+
+class ReplyKind(IntEnum):
+    """What a text message is replying to."""
+
+    NONE = 0
+    BOT = 1
+    PLAN = 2
+
+
+def _classify_reply(message: Message) -> ReplyKind:
+    """Check whether user is replying to a bot message, and if so to a plan."""
     reply = message.reply_to_message
-    return reply.from_user is not None and reply.from_user.is_bot
-
-
-def _is_reply_to_plan(message: Message) -> bool:
-    """Check if user is replying to a plan message from the bot."""
-    if not _is_reply_to_bot(message):
-        return False
-    original = message.reply_to_message.text or ""
-    plan_markers = [
-        "контент-план", "Контент-план", "Content Plan",
-        "Якорный пост", "якорный пост",
-        "TELEGRAM:", "LINKEDIN:",
-        "Пн:", "Вт:", "Ср:", "Чт:", "Пт:",
-    ]
-    return any(marker in original for marker in plan_markers)
+    if not (reply and reply.from_user and reply.from_user.is_bot):
+        return ReplyKind.NONE
+    if _PLAN_MARKER_RE.search(reply.text or ""):
+        return ReplyKind.PLAN
+    return ReplyKind.BOT
 
 
 async def _handle_plan_edit(message: Message) -> None:
     """Handle reply to a plan message - edit the plan via Claude."""
     status_msg = await message.answer("⏳ Редактирую план...")
 
-    settings = get_settings()
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
-    git = VaultGit(settings.vault_path)
+    processor = get_processor()
+    git = get_git()
 
     async def run_with_progress() -> dict:
         task = asyncio.create_task(
@@ -62,7 +66,7 @@ async def _handle_plan_edit(message: Message) -> None:
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -76,25 +80,22 @@ async def _handle_plan_edit(message: Message) -> None:
 
     report = await run_with_progress()
 
+    # Commit in the background while the report is being sent
+    commit_task = None
     if "error" not in report:
-        await asyncio.to_thread(
-            git.commit_and_push,
-            f"chore: edit plan {date.today().isoformat()}",
+        commit_task = asyncio.create_task(
+            git.commit_and_push_async(
+                f"chore: edit plan {date.today().isoformat()}",
+            ),
         )
 
-    formatted = format_process_report(report)
-    parts = split_html_report(formatted)
+    formatted = await asyncio.to_thread(format_process_report, report)
+    parts = await asyncio.to_thread(split_html_report, formatted)
 
-    try:
-        await status_msg.edit_text(parts[0])
-    except Exception:
-        await status_msg.edit_text(parts[0], parse_mode=None)
+    await send_parts(status_msg, message, parts)
 
-    for part in parts[1:]:
-        try:
-            await message.answer(part)
-        except Exception:
-            await message.answer(part, parse_mode=None)
+    if commit_task:
+        await commit_task
 
 
 @router.message(lambda m: m.text is not None and not m.text.startswith("/"))
@@ -108,16 +109,16 @@ async def handle_text(message: Message) -> None:
     if not message.text or not message.from_user:
         return
 
+    reply_kind = _classify_reply(message)
+
     # If replying to a plan message — edit the plan
-    if _is_reply_to_plan(message):
+    if reply_kind is ReplyKind.PLAN:
         logger.info("Reply to plan from user %s, editing plan", message.from_user.id)
         await _handle_plan_edit(message)
         return
 
     # If replying to a bot message — treat as dialogue with context
-    if _is_reply_to_bot(message):
-        from d_brain.bot.handlers.do import process_request
-
+    if reply_kind is ReplyKind.BOT:
         user_id = message.from_user.id
 
         # Build prompt with context of the original bot message
@@ -138,14 +139,13 @@ async def handle_text(message: Message) -> None:
         return
 
     # Otherwise — save as thought
-    settings = get_settings()
-    storage = VaultStorage(settings.vault_path)
+    storage = get_storage()
 
-    timestamp = datetime.fromtimestamp(message.date.timestamp())
+    timestamp = message.date.astimezone()
     storage.append_to_daily(message.text, timestamp, "[text]")
 
     # Log to session
-    session = SessionStore(settings.vault_path)
+    session = get_session_store()
     session.append(
         message.from_user.id,
         "text",
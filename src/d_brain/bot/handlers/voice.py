@@ -1,14 +1,11 @@
 """Voice message handler."""
 
 import logging
-from datetime import datetime
 
 from aiogram import Bot, Router
 from aiogram.types import Message
 
-from d_brain.config import get_settings
-from d_brain.services.session import SessionStore
-from d_brain.services.storage import VaultStorage
+from d_brain.bot.deps import get_config, get_session_store, get_storage
 from d_brain.services.transcription import DeepgramTranscriber
 
 router = Router(name="voice")
@@ -23,9 +20,8 @@ async def handle_voice(message: Message, bot: Bot) -> None:
 
     await message.chat.do(action="typing")
 
-    settings = get_settings()
-    storage = VaultStorage(settings.vault_path)
-    transcriber = DeepgramTranscriber(settings.deepgram_api_key)
+    storage = get_storage()
+    transcriber = DeepgramTranscriber(get_config().deepgram_api_key)
 
     try:
         file = await bot.get_file(message.voice.file_id)
@@ -45,11 +41,11 @@ async def handle_voice(message: Message, bot: Bot) -> None:
             await message.answer("Could not transcribe audio")
             return
 
-        timestamp = datetime.fromtimestamp(message.date.timestamp())
+        timestamp = message.date.astimezone()
         storage.append_to_daily(transcript, timestamp, "[voice]")
 
         # Log to session
-        session = SessionStore(settings.vault_path)
+        session = get_session_store()
         session.append(
             message.from_user.id,
             "voice",
@@ -7,10 +7,9 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from d_brain.bot.deps import get_git, get_processor
 from d_brain.bot.formatters import format_process_report
-from d_brain.config import get_settings
-from d_brain.services.git import VaultGit
-from d_brain.services.processor import ClaudeProcessor
+from d_brain.bot.sending import edit_html
 
 router = Router(name="weekly")
 logger = logging.getLogger(__name__)
@@ -24,25 +23,15 @@ async def cmd_weekly(message: Message) -> None:
 
     status_msg = await message.answer("⏳ Генерирую недельный дайджест...")
 
-    settings = get_settings()
-    processor = ClaudeProcessor(
-        settings.vault_path,
-        settings.ticktick_client_id,
-        settings.ticktick_client_secret,
-        settings.ticktick_access_token,
-        settings.planfix_account,
-        settings.planfix_token,
-    )
-    git = VaultGit(settings.vault_path)
+    processor = get_processor()
+    git = get_git()
 
     async def run_with_progress() -> dict:
-        task = asyncio.create_task(
-            asyncio.to_thread(processor.generate_weekly)
-        )
+        task = asyncio.create_task(asyncio.to_thread(processor.generate_weekly))
 
         elapsed = 0
         while not task.done():
-            await asyncio.sleep(30)
+            await asyncio.wait({task}, timeout=30)
             elapsed += 30
             if not task.done():
                 try:
@@ -58,10 +47,7 @@ async def cmd_weekly(message: Message) -> None:
 
     # Commit any changes (weekly goal updates, etc)
     if "error" not in report:
-        await asyncio.to_thread(git.commit_and_push, "chore: weekly digest")
+        await git.commit_and_push_async("chore: weekly digest")
 
     formatted = format_process_report(report)
-    try:
-        await status_msg.edit_text(formatted)
-    except Exception:
-        await status_msg.edit_text(formatted, parse_mode=None)
+    await edit_html(status_msg, formatted)
@@ -0,0 +1,38 @@
+"""Coalescing of identical concurrent blocking calls."""
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from typing import Any, cast
+
+_inflight: dict[str, asyncio.Task[Any]] = {}
+
+
+def _call_key(
+    func: Callable[..., Any],
+    args: tuple[object, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    name = getattr(func, "__qualname__", repr(func))
+    raw = repr((name, args, sorted(kwargs.items())))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+async def run_coalesced[**P, R](
+    func: Callable[P, R],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> R:
+    """Run a blocking call in a thread, sharing it with identical callers.
+
+    While a call with the same function and arguments is still running,
+    later callers await its result instead of starting a new one.
+    """
+    key = _call_key(func, args, kwargs)
+    task = cast("asyncio.Task[R] | None", _inflight.get(key))
+    if task is None:
+        task = asyncio.create_task(asyncio.to_thread(func, *args, **kwargs))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the call for the others
+    return await asyncio.shield(task)
@@ -1,11 +1,14 @@
 """Inline keyboards for content and plan sub-menus."""
 
+from functools import lru_cache
+
 from aiogram.types import InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 
+@lru_cache(maxsize=1)
 def content_menu_keyboard() -> InlineKeyboardMarkup:
-    """Inline menu for content seeds."""
+    """Inline menu for content seeds (static, built once)."""
     builder = InlineKeyboardBuilder()
     builder.button(text="📋 Мои seeds", callback_data="content:my_seeds")
     builder.button(text="🔄 Новые seeds", callback_data="content:new_seeds")
@@ -13,8 +16,9 @@ def content_menu_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@lru_cache(maxsize=1)
 def plan_menu_keyboard() -> InlineKeyboardMarkup:
-    """Inline menu for content plan."""
+    """Inline menu for content plan (static, built once)."""
     builder = InlineKeyboardBuilder()
     builder.button(text="👁 Текущий", callback_data="plan:current")
     builder.button(text="🔄 Новый план", callback_data="plan:new")
@@ -1,11 +1,14 @@
 """Reply keyboards for Telegram bot."""
 
+from functools import lru_cache
+
 from aiogram.types import ReplyKeyboardMarkup
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 
 
+@lru_cache(maxsize=1)
 def get_main_keyboard() -> ReplyKeyboardMarkup:
-    """Main reply keyboard with common commands."""
+    """Main reply keyboard with common commands (static, built once)."""
     builder = ReplyKeyboardBuilder()
     # First row: main commands
     builder.button(text="📊 Статус")
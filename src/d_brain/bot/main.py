@@ -1,7 +1,9 @@
 """Telegram bot initialization and polling."""
 
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from aiogram import Bot, Dispatcher
@@ -10,6 +12,7 @@ from aiogram.enums import ParseMode
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Update
 
+from d_brain.bot.deps import get_channel_reader
 from d_brain.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -25,7 +28,20 @@ def create_bot(settings: Settings) -> Bot:
 
 def create_dispatcher() -> Dispatcher:
     """Create and configure the dispatcher with routers."""
-    from d_brain.bot.handlers import buttons, callbacks, commands, content, content_plan, do, forward, photo, process, text, voice, weekly
+    from d_brain.bot.handlers import (
+        buttons,
+        callbacks,
+        commands,
+        content,
+        content_plan,
+        do,
+        forward,
+        photo,
+        process,
+        text,
+        voice,
+        weekly,
+    )
 
     # Use memory storage for FSM (required for /do command state)
     dp = Dispatcher(storage=MemoryStorage())
@@ -70,11 +86,13 @@ def create_auth_middleware(settings: Settings) -> MiddlewareType:
 
         # If no users allowed and not allow_all_users -> deny everyone
         if not settings.allowed_user_ids:
-            logger.warning("Access denied: no allowed_user_ids configured and allow_all_users is False")
+            logger.warning(
+                "Access denied: no allowed_user_ids configured and allow_all_users is False"
+            )
             return None
 
         # Check if user is in allowed list
-        if user and user.id not in settings.allowed_user_ids:
+        if user and user.id not in settings.allowed_user_ids_set:
             logger.warning("Unauthorized access attempt from user %s", user.id)
             return None
 
@@ -85,6 +103,12 @@ def create_auth_middleware(settings: Settings) -> MiddlewareType:
 
 async def run_bot(settings: Settings) -> None:
     """Run the bot with polling."""
+    # Claude calls hold a to_thread worker for minutes; the default pool
+    # (cpu_count + 4) is easily exhausted by a few concurrent requests
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=32),
+    )
+
     bot = create_bot(settings)
     dp = create_dispatcher()
 
@@ -95,4 +119,10 @@ async def run_bot(settings: Settings) -> None:
     try:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
+        # Only close a reader a handler actually created; calling the cached
+        # factory here would build a fresh client just to close it
+        if get_channel_reader.cache_info().currsize:
+            reader = get_channel_reader()
+            if reader:
+                await reader.close()
         await bot.session.close()
@@ -0,0 +1,49 @@
+"""Helpers for sending HTML replies to Telegram."""
+
+import asyncio
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message
+
+from d_brain.bot.formatters import telegram_parse_mode
+
+
+async def edit_html(message: Message, text: str) -> None:
+    """Edit message text, using HTML parse mode only if the markup is valid."""
+    parse_mode = telegram_parse_mode(text)
+    try:
+        await message.edit_text(text, parse_mode=parse_mode)
+    except TelegramBadRequest:
+        if parse_mode is None:
+            raise
+        # Markup passed the local check but Telegram still rejected it
+        await message.edit_text(text, parse_mode=None)
+
+
+async def answer_html(message: Message, text: str) -> None:
+    """Reply in chat, using HTML parse mode only if the markup is valid."""
+    parse_mode = telegram_parse_mode(text)
+    try:
+        await message.answer(text, parse_mode=parse_mode)
+    except TelegramBadRequest:
+        if parse_mode is None:
+            raise
+        await message.answer(text, parse_mode=None)
+
+
+async def _answer_all(message: Message, parts: list[str]) -> None:
+    for part in parts:
+        await answer_html(message, part)
+
+
+async def send_parts(status_msg: Message, message: Message, parts: list[str]) -> None:
+    """Put the first part into the status message and send the rest after it.
+
+    The status message already sits above the new ones, so its edit runs
+    alongside the sends. The remaining parts go out one by one to keep
+    their order in the chat.
+    """
+    await asyncio.gather(
+        edit_html(status_msg, parts[0]),
+        _answer_all(message, parts[1:]),
+    )
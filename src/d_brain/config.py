@@ -1,5 +1,6 @@
 """Application configuration using Pydantic Settings."""
 
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 from pydantic import Field
@@ -18,10 +19,24 @@ class Settings(BaseSettings):
     telegram_bot_token: str = Field(description="Telegram Bot API token")
     deepgram_api_key: str = Field(description="Deepgram API key for transcription")
     ticktick_client_id: str = Field(default="", description="TickTick OAuth Client ID")
-    ticktick_client_secret: str = Field(default="", description="TickTick OAuth Client Secret")
-    ticktick_access_token: str = Field(default="", description="TickTick OAuth Access Token")
-    planfix_account: str = Field(default="", description="Planfix account name (subdomain)")
+    ticktick_client_secret: str = Field(
+        default="", description="TickTick OAuth Client Secret"
+    )
+    ticktick_access_token: str = Field(
+        default="", description="TickTick OAuth Access Token"
+    )
+    planfix_account: str = Field(
+        default="", description="Planfix account name (subdomain)"
+    )
     planfix_token: str = Field(default="", description="Planfix REST API token")
+    claude_fast_model: str = Field(
+        default="",
+        description="Claude model for short tool-free calls (empty = CLI default)",
+    )
+    anthropic_api_key: str = Field(
+        default="",
+        description="Anthropic API key for direct tool-free calls (optional)",
+    )
     google_docs_folder_id: str = Field(
         default="",
         description="Google Drive folder ID with Fireflies transcripts",
@@ -47,6 +62,11 @@ class Settings(BaseSettings):
         description="Telegram channel username to read posts from (e.g. letsboss)",
     )
 
+    @cached_property
+    def allowed_user_ids_set(self) -> frozenset[int]:
+        """Allowed user IDs as a set for per-update membership checks."""
+        return frozenset(self.allowed_user_ids)
+
     @property
     def daily_path(self) -> Path:
         """Path to daily notes directory."""
@@ -68,6 +88,12 @@ class Settings(BaseSettings):
         return self.vault_path / "content"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings instance."""
+    """Get application settings instance (parsed once per process)."""
     return Settings()
+
+
+def reset_settings_cache() -> None:
+    """Drop the cached settings so the next get_settings() re-reads env."""
+    get_settings.cache_clear()
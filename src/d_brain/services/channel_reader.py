@@ -1,15 +1,33 @@
 """Telegram channel reader service via public web page."""
 
+import asyncio
+import heapq
 import logging
 import re
+import time
+from collections.abc import Iterator
 from datetime import date
 from pathlib import Path
+from typing import Any, Self
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
 TG_CHANNEL_URL = "https://t.me/s/{channel}"
+POSTS_CACHE_TTL = 60  # seconds
+# Cap on post text per prompt; long posts would otherwise crowd out the rest
+PROMPT_POSTS_CHARS = 20_000
+
+# Message body only; reply previews reuse the class with js-message_reply_text
+_TEXT_RE = re.compile(
+    r'class="tgme_widget_message_text(?! js-message_reply_text)[^"]*"[^>]*>(.*?)</div>',
+    re.DOTALL,
+)
+_VIEWS_RE = re.compile(r'class="tgme_widget_message_views">([^<]+)<')
+_DATE_RE = re.compile(r'datetime="([^"]+)"')
+_BR_RE = re.compile(r"<br\s*/?>")
+_TAG_RE = re.compile(r"<[^>]+>")
 
 
 class ChannelReader:
@@ -19,78 +37,101 @@ class ChannelReader:
         self.channel = channel
         self.vault_path = Path(vault_path)
         self._archive_dir = self.vault_path / "content" / "channel-archive"
+        self._archive_dir_created = False
+        self._post_id_re = re.compile(rf'data-post="{re.escape(channel)}/(\d+)"')
+        self._posts_cache: tuple[float, list[dict[str, Any]]] | None = None
+        self._fetch_lock = asyncio.Lock()
+        # Kept open so repeated fetches reuse the TCP/TLS connection
+        self._client = httpx.AsyncClient(timeout=30)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
 
-    async def get_recent_posts(self, limit: int = 50) -> list[dict]:
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def get_recent_posts(self, limit: int = 50) -> list[dict[str, Any]]:
         """Fetch recent posts from the channel web page.
 
+        The parsed page is cached for POSTS_CACHE_TTL seconds, so
+        concurrent handlers share a single fetch.
+
         Args:
             limit: Maximum number of posts to return.
 
         Returns:
             List of post dicts with keys: id, date, text, views.
         """
-        url = TG_CHANNEL_URL.format(channel=self.channel)
+        async with self._fetch_lock:
+            cached = self._posts_cache
+            if cached is None or time.monotonic() - cached[0] >= POSTS_CACHE_TTL:
+                url = TG_CHANNEL_URL.format(channel=self.channel)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
+                resp = await self._client.get(url)
+                resp.raise_for_status()
 
-        html = resp.text
-        return self._parse_posts(html, limit)
+                cached = (time.monotonic(), self._parse_posts(resp.text, None))
+                self._posts_cache = cached
 
-    def _parse_posts(self, html: str, limit: int) -> list[dict]:
-        """Parse posts from Telegram channel web page HTML."""
-        # Extract post IDs
-        post_ids = re.findall(
-            rf'data-post="{re.escape(self.channel)}/(\d+)"', html
-        )
+        return cached[1][:limit]
 
-        # Extract texts (HTML content inside message_text divs)
-        raw_texts = re.findall(
-            r'class="tgme_widget_message_text[^"]*"[^>]*>(.*?)</div>',
-            html,
-            re.DOTALL,
-        )
+    def _parse_posts(self, html: str, limit: int | None) -> list[dict[str, Any]]:
+        """Parse posts from Telegram channel web page HTML.
 
-        # Extract views
-        raw_views = re.findall(
-            r'class="tgme_widget_message_views">([^<]+)<', html
-        )
+        The page is cut into one block per message (from its data-post
+        attribute to the next one), and each field is looked up inside its
+        own block, so posts without text don't shift the other fields.
+        """
+        post_matches = list(self._post_id_re.finditer(html))
 
-        # Extract dates
-        raw_dates = re.findall(r'datetime="([^"]+)"', html)
+        posts: list[dict[str, Any]] = []
+        for i, post_match in enumerate(post_matches):
+            block_end = (
+                post_matches[i + 1].start() if i + 1 < len(post_matches) else len(html)
+            )
+            block = html[post_match.end() : block_end]
 
-        posts: list[dict] = []
-        count = min(len(post_ids), len(raw_texts))
+            text_match = _TEXT_RE.search(block)
+            if not text_match:
+                continue
 
-        for i in range(count):
-            # Strip HTML tags from text
-            clean_text = re.sub(r"<br\s*/?>", "\n", raw_texts[i])
-            clean_text = re.sub(r"<[^>]+>", "", clean_text).strip()
+            # Strip HTML tags from text (plain-text posts skip the regexes)
+            clean_text = text_match.group(1)
+            if "<" in clean_text:
+                clean_text = _BR_RE.sub("\n", clean_text)
+                clean_text = _TAG_RE.sub("", clean_text)
+            clean_text = clean_text.strip()
 
             if not clean_text:
                 continue
 
             # Parse views (handle K/M suffixes)
             views = 0
-            if i < len(raw_views):
-                views = self._parse_views(raw_views[i].strip())
+            views_match = _VIEWS_RE.search(block)
+            if views_match:
+                views = self._parse_views(views_match.group(1).strip())
 
             # Parse date
             post_date = ""
-            if i < len(raw_dates):
-                post_date = raw_dates[i][:10]  # YYYY-MM-DD
-
-            posts.append({
-                "id": int(post_ids[i]),
-                "date": post_date,
-                "text": clean_text,
-                "views": views,
-            })
-
-        # Return most recent first, limited
-        posts.reverse()
-        posts = posts[:limit]
+            date_match = _DATE_RE.search(block)
+            if date_match:
+                post_date = date_match.group(1)[:10]  # YYYY-MM-DD
+
+            posts.append(
+                {
+                    "id": int(post_match.group(1)),
+                    "date": post_date,
+                    "text": clean_text,
+                    "views": views,
+                }
+            )
+
+        # Return most recent first, limited (one backward copy)
+        posts = posts[::-1] if limit is None else posts[: -limit - 1 : -1]
 
         logger.info("Fetched %d posts from @%s", len(posts), self.channel)
         return posts
@@ -108,14 +149,26 @@ class ChannelReader:
         except ValueError:
             return 0
 
-    async def save_to_vault(self, posts: list[dict]) -> Path:
+    async def save_to_vault(self, posts: list[dict[str, Any]]) -> Path:
         """Save posts to vault/content/channel-archive/ as markdown."""
-        self._archive_dir.mkdir(parents=True, exist_ok=True)
+        if not self._archive_dir_created:
+            self._archive_dir.mkdir(parents=True, exist_ok=True)
+            self._archive_dir_created = True
 
         today = date.today().isoformat()
         archive_path = self._archive_dir / f"{today}-archive.md"
 
-        lines = [
+        _write_lines(archive_path, self._iter_archive_lines(posts, today))
+        logger.info("Channel archive saved to %s", archive_path)
+        return archive_path
+
+    def _iter_archive_lines(
+        self,
+        posts: list[dict[str, Any]],
+        today: str,
+    ) -> Iterator[str]:
+        """Yield channel archive markdown line by line."""
+        yield from (
             "---",
             f"date: {today}",
             "type: channel-archive",
@@ -125,34 +178,46 @@ class ChannelReader:
             "",
             f"# Channel Archive @{self.channel} - {today}",
             "",
-        ]
+        )
 
         for post in posts:
-            lines.extend([
+            yield from (
                 f"## [{post['date']}] (views: {post['views']})",
                 "",
                 post["text"],
                 "",
                 "---",
                 "",
-            ])
-
-        archive_path.write_text("\n".join(lines))
-        logger.info("Channel archive saved to %s", archive_path)
-        return archive_path
-
-    def format_for_prompt(self, posts: list[dict], limit: int = 20) -> str:
-        """Format posts for inclusion in Claude prompt."""
+            )
+
+    def format_for_prompt(
+        self,
+        posts: list[dict[str, Any]],
+        limit: int = 20,
+        max_chars: int = PROMPT_POSTS_CHARS,
+    ) -> str:
+        """Format posts for inclusion in Claude prompt.
+
+        Posts are taken newest first until limit or max_chars of post text
+        is reached; the newest post is always included.
+        """
         if not posts:
             return ""
 
-        lines = []
+        lines: list[str] = []
+        total = 0
         for post in posts[:limit]:
-            lines.extend([
-                f"--- POST [{post['date']}] (views: {post['views']}) ---",
-                post["text"],
-                "",
-            ])
+            total += len(post["text"])
+            if lines and total > max_chars:
+                lines.append("[...older posts omitted...]")
+                break
+            lines.extend(
+                [
+                    f"--- POST [{post['date']}] (views: {post['views']}) ---",
+                    post["text"],
+                    "",
+                ]
+            )
 
         return "\n".join(lines)
 
@@ -165,14 +230,22 @@ class ChannelReader:
         if not posts:
             raise ValueError(f"No posts found in @{self.channel}")
 
-        # Sort by views (descending) — most engaging = best tone examples
-        sorted_posts = sorted(posts, key=lambda p: p["views"], reverse=True)
-        top_posts = sorted_posts[:15]
+        # Top by views — most engaging = best tone examples
+        top_posts = heapq.nlargest(15, posts, key=lambda p: p["views"])
         # Re-sort by date for readability
         top_posts.sort(key=lambda p: p["date"])
 
+        ref_path = (
+            self.vault_path / ".claude/skills/content-seeds/references/tone-examples.md"
+        )
+        _write_lines(ref_path, self._iter_tone_lines(top_posts))
+        logger.info("Tone examples saved to %s (%d posts)", ref_path, len(top_posts))
+        return ref_path
+
+    def _iter_tone_lines(self, top_posts: list[dict[str, Any]]) -> Iterator[str]:
+        """Yield tone-of-voice examples markdown line by line."""
         today = date.today().isoformat()
-        lines = [
+        yield from (
             "# Tone of Voice - примеры постов Марины",
             "",
             f"Автоматически собрано {today} из @{self.channel}.",
@@ -186,10 +259,10 @@ class ChannelReader:
             "",
             "---",
             "",
-        ]
+        )
 
         for i, post in enumerate(top_posts, 1):
-            lines.extend([
+            yield from (
                 f"### Пример {i}",
                 f"**Дата:** {post['date']} | **Views:** {post['views']}",
                 "",
@@ -197,12 +270,10 @@ class ChannelReader:
                 "",
                 "---",
                 "",
-            ])
+            )
 
-        ref_path = (
-            self.vault_path
-            / ".claude/skills/content-seeds/references/tone-examples.md"
-        )
-        ref_path.write_text("\n".join(lines))
-        logger.info("Tone examples saved to %s (%d posts)", ref_path, len(top_posts))
-        return ref_path
+
+def _write_lines(path: Path, lines: Iterator[str]) -> None:
+    """Stream lines to a file without building the whole text in memory."""
+    with path.open("w", encoding="utf-8") as f:
+        f.writelines(f"{line}\n" for line in lines)
@@ -2,8 +2,12 @@
 
 import io
 import logging
+import os
 import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,22 @@ GOOGLE_DOC_MIME = "application/vnd.google-apps.document"
 DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 FOLDER_MIME = "application/vnd.google-apps.folder"
 
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEPARATOR_RE = re.compile(r"[-\s_]+")
+_GDOC_ID_RE = re.compile(rb"^gdoc_id:\s*(.+)$", re.MULTILINE)
+# gdoc_id is written right after the opening "---", so the head is enough
+FRONTMATTER_HEAD_BYTES = 1024
+
+
+def _read_gdoc_id(md_file: str) -> str | None:
+    """Read gdoc_id from a meeting file's frontmatter."""
+    with open(md_file, "rb") as f:
+        head = f.read(FRONTMATTER_HEAD_BYTES)
+    match = _GDOC_ID_RE.search(head)
+    if match:
+        return match.group(1).strip().decode("utf-8", errors="replace")
+    return None
+
 
 class GoogleDocsSync:
     """Sync meeting transcripts from Google Drive folder to vault."""
@@ -26,42 +46,57 @@ class GoogleDocsSync:
         self.folder_id = folder_id
         self.credentials_path = credentials_path
         self.meetings_path = self.vault_path / "content" / "meetings"
+        self._meetings_dir_created = False
+        # Built on first sync and reused: credentials and API client
+        self._drive: Any = None
 
     def _get_existing_gdoc_ids(self) -> set[str]:
         """Scan existing meeting files for gdoc_id in frontmatter."""
-        ids: set[str] = set()
-        if not self.meetings_path.exists():
-            return ids
-        for md_file in self.meetings_path.glob("*.md"):
-            content = md_file.read_text()
-            match = re.search(r"^gdoc_id:\s*(.+)$", content, re.MULTILINE)
-            if match:
-                ids.add(match.group(1).strip())
-        return ids
+        try:
+            with os.scandir(self.meetings_path) as it:
+                md_files = [
+                    e.path for e in it if e.name.endswith(".md") and e.is_file()
+                ]
+        except FileNotFoundError:
+            return set()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            return {gdoc_id for gdoc_id in pool.map(_read_gdoc_id, md_files) if gdoc_id}
 
     @staticmethod
     def _slugify(title: str) -> str:
         """Convert title to filesystem-safe slug."""
-        slug = title.lower().strip()
-        slug = re.sub(r"[^\w\s-]", "", slug)
-        slug = re.sub(r"[\s_]+", "-", slug)
-        slug = re.sub(r"-+", "-", slug)
+        slug = _SLUG_STRIP_RE.sub("", title.lower().strip())
+        slug = _SLUG_SEPARATOR_RE.sub("-", slug)
         return slug[:80].strip("-")
 
-    def _list_files_recursive(self, drive, folder_id: str) -> list[dict]:
+    @staticmethod
+    def _iter_folder(drive: Any, folder_id: str) -> Iterator[dict[str, Any]]:
+        """Yield every item in a folder, following pagination."""
+        query = f"'{folder_id}' in parents and trashed=false"
+        page_token = None
+        while True:
+            results = (
+                drive.files()
+                .list(
+                    q=query,
+                    fields="nextPageToken, files(id, name, mimeType, createdTime)",
+                    orderBy="createdTime desc",
+                    pageSize=100,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            yield from results.get("files", [])
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+
+    def _list_files_recursive(self, drive: Any, folder_id: str) -> list[dict[str, Any]]:
         """List all document files in folder and subfolders."""
-        all_files: list[dict] = []
+        all_files: list[dict[str, Any]] = []
 
         # Get everything in this folder
-        query = f"'{folder_id}' in parents and trashed=false"
-        results = drive.files().list(
-            q=query,
-            fields="files(id, name, mimeType, createdTime)",
-            orderBy="createdTime desc",
-            pageSize=100,
-        ).execute()
-
-        for item in results.get("files", []):
+        for item in self._iter_folder(drive, folder_id):
             mime = item.get("mimeType", "")
             if mime == FOLDER_MIME:
                 # Recurse into subfolder
@@ -72,20 +107,14 @@ class GoogleDocsSync:
 
         return all_files
 
-    def _extract_docx_text(self, drive, file_id: str) -> str:
+    def _extract_docx_text(self, drive: Any, file_id: str) -> str:
         """Download and extract text from a .docx file."""
         try:
             from docx import Document
         except ImportError:
             # Fallback: download as plain text via Google Drive export
             logger.warning("python-docx not installed, trying Drive export")
-            request = drive.files().export_media(
-                fileId=file_id, mimeType="text/plain"
-            )
-            content = request.execute()
-            if isinstance(content, bytes):
-                return content.decode("utf-8", errors="replace")
-            return str(content)
+            return self._export_text(drive, file_id)
 
         # Download .docx binary
         request = drive.files().get_media(fileId=file_id)
@@ -95,7 +124,20 @@ class GoogleDocsSync:
         paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
         return "\n".join(paragraphs)
 
-    def sync(self) -> dict:
+    @staticmethod
+    def _export_text(drive: Any, file_id: str) -> str:
+        """Export a Google Doc as plain text via Drive."""
+        from googleapiclient.http import MediaIoBaseDownload  # type: ignore[import-untyped]
+
+        request = drive.files().export_media(fileId=file_id, mimeType="text/plain")
+        buf = io.BytesIO()
+        downloader = MediaIoBaseDownload(buf, request)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk()
+        return buf.getvalue().decode("utf-8", errors="replace")
+
+    def sync(self) -> dict[str, Any]:
         """Sync Google Docs from folder to vault.
 
         Returns:
@@ -104,10 +146,6 @@ class GoogleDocsSync:
         if not self.folder_id:
             return {"synced": 0, "skipped": "not_configured"}
 
-        if not self.credentials_path or not self.credentials_path.exists():
-            logger.warning("Google credentials file not found: %s", self.credentials_path)
-            return {"synced": 0, "skipped": "no_credentials"}
-
         try:
             from google.oauth2.service_account import Credentials
             from googleapiclient.discovery import build
@@ -116,21 +154,28 @@ class GoogleDocsSync:
             return {"synced": 0, "skipped": "libs_not_installed"}
 
         try:
-            creds = Credentials.from_service_account_file(
-                str(self.credentials_path),
-                scopes=[
-                    "https://www.googleapis.com/auth/drive.readonly",
-                    "https://www.googleapis.com/auth/documents.readonly",
-                ],
+            if self._drive is None:
+                creds = Credentials.from_service_account_file(
+                    str(self.credentials_path),
+                    scopes=["https://www.googleapis.com/auth/drive.readonly"],
+                )
+                self._drive = build(
+                    "drive",
+                    "v3",
+                    credentials=creds,
+                    cache_discovery=False,
+                )
+            drive = self._drive
+        except (FileNotFoundError, IsADirectoryError):
+            logger.warning(
+                "Google credentials file not found: %s", self.credentials_path
             )
-            drive = build("drive", "v3", credentials=creds)
-            docs = build("docs", "v1", credentials=creds)
+            return {"synced": 0, "skipped": "no_credentials"}
         except Exception as e:
             logger.error("Failed to initialize Google API: %s", e)
             return {"synced": 0, "error": str(e)}
 
         existing_ids = self._get_existing_gdoc_ids()
-        self.meetings_path.mkdir(parents=True, exist_ok=True)
 
         synced = 0
         skipped = 0
@@ -139,19 +184,20 @@ class GoogleDocsSync:
             files = self._list_files_recursive(drive, self.folder_id)
             logger.info("Found %d docs in Google Drive folder (recursive)", len(files))
 
-            for file_info in files:
+            new_files = [f for f in files if f["id"] not in existing_ids]
+            skipped += len(files) - len(new_files)
+            if new_files and not self._meetings_dir_created:
+                self.meetings_path.mkdir(parents=True, exist_ok=True)
+                self._meetings_dir_created = True
+
+            for file_info in new_files:
                 gdoc_id = file_info["id"]
                 mime = file_info.get("mimeType", "")
 
-                if gdoc_id in existing_ids:
-                    skipped += 1
-                    continue
-
                 try:
                     # Extract text based on file type
                     if mime == GOOGLE_DOC_MIME:
-                        doc = docs.documents().get(documentId=gdoc_id).execute()
-                        text = self._extract_text(doc)
+                        text = self._export_text(drive, gdoc_id)
                     elif mime == DOCX_MIME:
                         text = self._extract_docx_text(drive, gdoc_id)
                     else:
@@ -195,21 +241,3 @@ class GoogleDocsSync:
             return {"synced": synced, "skipped": skipped, "error": str(e)}
 
         return {"synced": synced, "skipped": skipped}
-
-    @staticmethod
-    def _extract_text(doc: dict) -> str:
-        """Extract plain text from Google Docs document JSON."""
-        text_parts: list[str] = []
-        body = doc.get("body", {})
-        content = body.get("content", [])
-
-        for element in content:
-            paragraph = element.get("paragraph")
-            if not paragraph:
-                continue
-            for elem in paragraph.get("elements", []):
-                text_run = elem.get("textRun")
-                if text_run:
-                    text_parts.append(text_run.get("content", ""))
-
-        return "".join(text_parts)
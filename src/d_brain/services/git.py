@@ -1,7 +1,9 @@
 """Git automation service for vault."""
 
+import asyncio
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -12,6 +14,8 @@ class VaultGit:
 
     def __init__(self, vault_path: Path) -> None:
         self.vault_path = Path(vault_path)
+        # Single worker: git commands on one repo must not overlap (index.lock)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="git")
 
     def _run_git(self, *args: str) -> subprocess.CompletedProcess[str]:
         """Run git command in vault directory."""
@@ -86,3 +90,22 @@ class VaultGit:
         if self.commit_changes(message):
             return self.push()
         return True  # No changes is not an error
+
+    async def commit_and_push_async(self, message: str) -> bool:
+        """Commit all changes and push from async code.
+
+        Runs on the service's own git thread, so commits don't wait behind
+        long Claude calls in the default executor.
+
+        Args:
+            message: Commit message
+
+        Returns:
+            True if successful
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.commit_and_push,
+            message,
+        )
@@ -1,17 +1,354 @@
 """Claude processing service."""
 
+import heapq
+import json
 import logging
 import os
+import re
+import signal
 import subprocess
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache, partial
+from io import BufferedReader
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
+
+import httpx
 
 from d_brain.services.session import SessionStore
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 1200  # 20 minutes
+PIPE_CHUNK_SIZE = 65536
+STDERR_TAIL_BYTES = 65536  # stderr is only used for error messages
+MAX_PARALLEL_SUMMARIES = 4
+SUMMARY_INDEX_FILE = ".summary_index.json"  # machine-local, ignored in vault/.gitignore
+MOC_PREVIOUS_WEEKS = "## Previous Weeks\n"
+# Meetings longer than this are always summarized
+MEETING_SUMMARY_CHARS = 5000
+# Shorter meetings are summarized too, largest first, while the raw
+# material is over budget; below the floor a summary saves too little
+RAW_MATERIAL_BUDGET = 120_000
+MEETING_SUMMARY_FLOOR = 1000
+# Expected length of a summary, used to estimate what summarizing saves
+MEETING_SUMMARY_ESTIMATE = MEETING_SUMMARY_CHARS // 2
+# Hard cap per source once summaries are in (e.g. a summary failed)
+RAW_SOURCE_MAX_CHARS = RAW_MATERIAL_BUDGET // 4
+
+ANTHROPIC_API_URL = "https://api.anthropic.com"
+ANTHROPIC_API_VERSION = "2023-06-01"
+FAST_MAX_TOKENS = 8192
+
+
+# Telegram HTML → Obsidian Markdown in one pass; each alternative's inner
+# text is converted recursively, so nested tags come out as before
+_HTML_TO_MD_RE = re.compile(
+    r"<b>(?P<b>.*?)</b>"
+    r"|<i>(?P<i>.*?)</i>"
+    r"|<code>(?P<code>.*?)</code>"
+    r"|<s>(?P<s>.*?)</s>"
+    r"|</?u>"
+    r'|<a href="(?P<href>[^"]+)">(?P<label>(?s:.+?))</a>'
+)
+
+# Obsidian Markdown → Telegram HTML: bold goes first in its own pass, so
+# "**bold***italic*" still splits as before; the rest share one pass
+_MD_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_MD_TO_HTML_RE = re.compile(
+    r"(?<!\*)\*(?P<i>[^*]+?)\*(?!\*)"
+    r"|`(?P<code>[^`]+?)`"
+    r"|~~(?P<s>.+?)~~"
+    r"|\[(?P<label>[^\]]+)\]\((?P<href>[^)]+)\)"
+)
+
+
+def _html_to_md_repl(m: re.Match[str]) -> str:
+    kind = m.lastgroup
+    if kind == "b":
+        return f"**{_HTML_TO_MD_RE.sub(_html_to_md_repl, m['b'])}**"
+    if kind == "i":
+        return f"*{_HTML_TO_MD_RE.sub(_html_to_md_repl, m['i'])}*"
+    if kind == "code":
+        return f"`{_HTML_TO_MD_RE.sub(_html_to_md_repl, m['code'])}`"
+    if kind == "s":
+        return f"~~{_HTML_TO_MD_RE.sub(_html_to_md_repl, m['s'])}~~"
+    if kind == "label":
+        label = _HTML_TO_MD_RE.sub(_html_to_md_repl, m["label"])
+        if "<" in label:
+            # Unsupported markup inside the link text: keep it as HTML
+            return f'<a href="{m["href"]}">{label}</a>'
+        return f"[{label}]({m['href']})"
+    # <u> has no Markdown equivalent, just keep the text
+    return ""
+
+
+def _md_to_html_repl(m: re.Match[str]) -> str:
+    kind = m.lastgroup
+    if kind == "i":
+        return f"<i>{_MD_TO_HTML_RE.sub(_md_to_html_repl, m['i'])}</i>"
+    if kind == "code":
+        return f"<code>{_MD_TO_HTML_RE.sub(_md_to_html_repl, m['code'])}</code>"
+    if kind == "s":
+        return f"<s>{_MD_TO_HTML_RE.sub(_md_to_html_repl, m['s'])}</s>"
+    label = _MD_TO_HTML_RE.sub(_md_to_html_repl, m["label"])
+    return f'<a href="{m["href"]}">{label}</a>'
+
+
+_WEEK_FIELD_RE = re.compile(r"week:\s*(\S+)")
+_SEED_WEEK_FILENAME_RE = re.compile(r"(\d{4}-W\d{2})")
+_NUMBER_RE = re.compile(r"\d+")
+# Seed headings: "Seed #N: title" or "**Seed #N: title**". The title runs
+# greedily to the end of the line (closing asterisks are stripped by the
+# caller), so a line full of "**" can't make the engine backtrack.
+_SEED_HEADING_RE = re.compile(r"\*{0,2}Seed\s*#(\d+)[:\s]+(.+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def markdown_to_html(md: str) -> str:
+    """Convert Obsidian Markdown back to Telegram HTML.
+
+    Cached: the same seeds and plans are expanded repeatedly from the bot.
+    """
+    text = _MD_BOLD_RE.sub(r"<b>\1</b>", md)
+    return _MD_TO_HTML_RE.sub(_md_to_html_repl, text)
+
+
+def _md_entries_newest_first(
+    directory: str,
+    limit: int | None = None,
+) -> list[os.DirEntry[str]]:
+    """List *.md files in a dated-notes directory, latest name first.
+
+    Uses os.scandir so names and file types come from the directory
+    listing itself. With a limit, only the latest `limit` entries are
+    kept (partial sort). Returns an empty list if the directory is missing.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+    except FileNotFoundError:
+        return []
+    if limit is not None:
+        return heapq.nlargest(limit, entries, key=lambda e: e.name)
+    entries.sort(key=lambda e: e.name, reverse=True)
+    return entries
+
+
+def _feed_stdin(pipe: IO[bytes], parts: Sequence[str | bytes]) -> None:
+    """Write the prompt and close stdin; the CLI may exit before reading it all."""
+    try:
+        for part in parts:
+            pipe.write(part if isinstance(part, bytes) else part.encode())
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+
+def _kill_process_group(pgid: int) -> None:
+    """SIGKILL a process group, ignoring one that is gone or out of reach."""
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError as e:  # ProcessLookupError, PermissionError
+        logger.debug("Could not kill process group %d: %s", pgid, e)
+
+
+def _drain_pipe(
+    pipe: BufferedReader,
+    buf: bytearray,
+    name: str,
+    tail: int | None = None,
+) -> None:
+    """Read a pipe to EOF in chunks, logging progress as output arrives.
+
+    With tail set, only the last `tail` bytes are kept in buf.
+    """
+    total = 0
+    with pipe:
+        while chunk := pipe.read1(PIPE_CHUNK_SIZE):
+            buf += chunk
+            total += len(chunk)
+            if tail is not None and len(buf) > tail:
+                del buf[:-tail]
+            logger.debug("Claude %s: %d bytes so far", name, total)
+
+
+def _dated_md_entries(directory: str, cutoff: str) -> list[os.DirEntry[str]]:
+    """List YYYY-MM-DD*.md files dated cutoff (ISO date) or later, latest first."""
+    entries = []
+    for entry in _md_entries_newest_first(directory):
+        # ISO dates compare correctly as strings, and names come sorted
+        # newest first: once one is before the cutoff, so is every later one
+        if entry.name[:10] < cutoff:
+            break
+        try:
+            date.fromisoformat(entry.name[:10])
+        except ValueError:
+            continue
+        entries.append(entry)
+    return entries
+
+
+def _read_text(path: str) -> str:
+    """Read a file, treating one deleted since it was listed as empty."""
+    try:
+        return Path(path).read_text()
+    except FileNotFoundError:
+        return ""
+
+
+def _strip_frontmatter(data: bytes) -> bytes:
+    """Drop a leading '---' ... '---' frontmatter block, if any."""
+    if data.startswith(b"---"):
+        end = data.find(b"\n---", 3)
+        if end != -1:
+            return data[end + 4 :]
+    return data
+
+
+_WEEK_NOTE_FRONTMATTER = "---\ndate: {date}\ntype: {kind}\nweek: {week}\n---\n\n"
+
+
+def _write_note(path: Path, frontmatter: str, content: str) -> None:
+    """Write frontmatter and body straight to the file, without joining them."""
+    with open(path, "wb") as f:
+        f.write(frontmatter.encode("utf-8"))
+        f.write(content.encode("utf-8"))
+
+
+def _load_summary_index(meetings_dir: str) -> dict[str, dict[str, Any]]:
+    """Load cached meeting summaries: name -> {"mtime_ns", "summary"}."""
+    try:
+        with open(os.path.join(meetings_dir, SUMMARY_INDEX_FILE), "rb") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable summary index: %s", e)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_summary_index(meetings_dir: str, index: dict[str, dict[str, Any]]) -> None:
+    """Write the summary index atomically (temp file + rename)."""
+    index_path = os.path.join(meetings_dir, SUMMARY_INDEX_FILE)
+    tmp_path = f"{index_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning("Failed to save summary index: %s", e)
+
+
+# Static tail of the execute_prompt prompt, encoded once
+_EXECUTE_MCP_RULES = """\
+ПЕРВЫМ ДЕЛОМ: вызови mcp__ticktick__get_user_projects чтобы убедиться что MCP работает.
+
+CRITICAL MCP RULE:
+- ТЫ ИМЕЕШЬ ДОСТУП к mcp__ticktick__* tools И mcp__planfix__* tools — ВЫЗЫВАЙ ИХ НАПРЯМУЮ
+- НИКОГДА не пиши "MCP недоступен" или "добавь вручную"
+- Для ЛИЧНЫХ задач и менторства: mcp__ticktick__*
+- Для КОМАНДНЫХ задач (SMMEKALKA, C-GROWTH, KLEVERS): mcp__planfix__*
+- Если tool вернул ошибку — покажи ТОЧНУЮ ошибку в отчёте
+
+""".encode()
+_EXECUTE_OUTPUT_RULES = b"""\
+CRITICAL OUTPUT FORMAT:
+- Return ONLY raw HTML for Telegram (parse_mode=HTML)
+- NO markdown: no **, no ##, no ```, no tables, no -
+- Start with emoji and <b>header</b>
+- Allowed tags: <b>, <i>, <code>, <s>, <u>
+- Be concise - Telegram has 4096 char limit
+
+EXECUTION:
+1. Analyze the request
+2. Call MCP tools directly (mcp__ticktick__*, mcp__planfix__*, read/write files)
+3. Return HTML status report with results"""
+
+# Static tails of the content seeds and plan prompts, encoded once
+_SEEDS_RULES = """
+=== END RAW MATERIAL ===
+
+CRITICAL OUTPUT FORMAT:
+- Return ONLY raw HTML for Telegram (parse_mode=HTML)
+- NO markdown: no **, no ##, no ```, no tables
+- Allowed tags: <b>, <i>, <code>, <s>, <u>
+- Follow the output format from SKILL INSTRUCTIONS exactly
+
+CRITICAL RULES:
+- Оценивай seeds по матрице из CONTENT STRATEGY (арка, функция, тон)
+- Каждый seed ОБЯЗАН принадлежать одной из 3 нарративных арок
+- Целься в конкретный сегмент ICP - кто прочтёт и кивнёт?
+- Применяй ВСЕ правила из TONE OF VOICE (голос Марины + анти-AI фильтр)
+- Каждый hook проверяй на AI-паттерны перед выдачей
+- Пиши как живой человек, не как ChatGPT""".encode()
+_PLAN_GENERATE_RULES = """
+
+CRITICAL OUTPUT FORMAT:
+- Return ONLY raw HTML for Telegram (parse_mode=HTML)
+- NO markdown: no **, no ##, no ```, no tables
+- Allowed tags: <b>, <i>, <code>, <s>, <u>
+- Follow the output format from SKILL INSTRUCTIONS exactly
+
+CRITICAL RULES:
+- Чередуй нарративные арки по правилам CONTENT STRATEGY
+- Проверяй последние посты канала - не повторять тему
+- Каждый пост целься в конкретный сегмент ICP
+- Все hooks пиши живым языком по правилам TONE OF VOICE
+- Никакого AI-стиля, канцелярита, шаблонных переходов""".encode()
+_PLAN_RECONCILE_RULES = """
+=== END POSTS ===
+
+ЗАДАЧА:
+1. Определи какие посты из плана уже опубликованы - отметь их ✅
+2. Для неопубликованных - оставь как есть или скорректируй если нужно
+3. Проверь чередование арок по правилам CONTENT STRATEGY
+4. Верни полный обновлённый план
+
+CRITICAL OUTPUT FORMAT:
+- Return ONLY raw HTML for Telegram (parse_mode=HTML)
+- NO markdown: no **, no ##, no ```, no tables
+- Allowed tags: <b>, <i>, <code>, <s>, <u>
+- Все hooks пиши живым языком по правилам TONE OF VOICE""".encode()
+_PLAN_EDIT_RULES = """
+
+ЗАДАЧА:
+- Внеси запрошенные изменения в план
+- Сохрани общую структуру плана (дни, форматы, LinkedIn)
+- Используй seeds из списка если нужно заменить/добавить контент
+- Чередуй арки по правилам CONTENT STRATEGY
+- Все hooks пиши живым языком по правилам TONE OF VOICE
+
+CRITICAL OUTPUT FORMAT:
+- Return the FULL updated plan in raw HTML for Telegram
+- NO markdown: no **, no ##, no ```, no tables
+- Allowed tags: <b>, <i>, <code>, <s>, <u>""".encode()
+
+
+def _plan_references(tone_of_voice: str, strategy: str, icp: str) -> list[str]:
+    """Build the optional reference sections of a content seeds or plan prompt."""
+    references = []
+    if tone_of_voice:
+        references.append(
+            f"\n=== TONE OF VOICE & HUMANIZER ===\n{tone_of_voice}\n"
+            "=== END TONE OF VOICE ===\n"
+        )
+    if strategy:
+        references.append(
+            f"\n=== CONTENT STRATEGY ===\n{strategy}\n=== END STRATEGY ===\n"
+        )
+    if icp:
+        references.append(f"\n=== ICP & POSITIONING ===\n{icp}\n=== END ICP ===\n")
+    return references
 
 
 class ClaudeProcessor:
@@ -25,6 +362,8 @@ class ClaudeProcessor:
         ticktick_access_token: str = "",
         planfix_account: str = "",
         planfix_token: str = "",
+        fast_model: str = "",
+        api_key: str = "",
     ) -> None:
         self.vault_path = Path(vault_path)
         self.ticktick_client_id = ticktick_client_id
@@ -32,20 +371,63 @@ class ClaudeProcessor:
         self.ticktick_access_token = ticktick_access_token
         self.planfix_account = planfix_account
         self.planfix_token = planfix_token
+        self.fast_model = fast_model
         self._mcp_config_path = (self.vault_path.parent / "mcp-config.json").resolve()
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=8,
+            thread_name_prefix="processor-io",
+        )
+        # Scanned directories as plain strings for os.scandir/os.path.join
+        vault = str(self.vault_path)
+        self._daily_dir = os.path.join(vault, "daily")
+        self._meetings_dir = os.path.join(vault, "content", "meetings")
+        self._thoughts_dir = os.path.join(vault, "thoughts")
+        self._seeds_dir = os.path.join(vault, "content", "seeds")
+        self._subprocess_env: dict[str, str] | None = None
+        self._session_store: SessionStore | None = None
+        # user_id -> (today's entry count, last entry ts, formatted context)
+        self._session_cache: dict[int, tuple[int, str, str]] = {}
+        # path -> (st_mtime_ns, st_size, text) for skill and reference files
+        self._file_cache: dict[Path, tuple[int, int, str]] = {}
+        # max_weeks -> ((name, st_mtime_ns, st_size) of each seed file, joined text)
+        self._all_seeds_cache: dict[
+            int, tuple[tuple[tuple[str, int, int], ...], str]
+        ] = {}
+        # plan path -> (st_mtime_ns, st_size, plan text without frontmatter)
+        self._plan_cache: dict[Path, tuple[int, int, str]] = {}
+        # (st_mtime_ns of .dismissed.json, dismissed seed keys)
+        self._dismissed_cache: tuple[int, frozenset[str]] | None = None
+        # Direct API client for tool-free calls; reused so connections stay open
+        self._api_client = (
+            httpx.Client(
+                base_url=ANTHROPIC_API_URL,
+                headers={
+                    "x-api-key": api_key,
+                    "anthropic-version": ANTHROPIC_API_VERSION,
+                },
+            )
+            if api_key and fast_model
+            else None
+        )
 
     def _build_subprocess_env(self) -> dict[str, str]:
         """Build environment for Claude subprocess.
 
         Ensures PATH, HOME, and MCP-related vars are set correctly,
         especially when running from systemd where env is minimal.
+        Built once and reused: neither the environment nor the
+        credentials change while the bot runs.
         """
+        if self._subprocess_env is not None:
+            return self._subprocess_env
+
         env = os.environ.copy()
         # Ensure critical paths are available (systemd may have minimal PATH)
         path = env.get("PATH", "/usr/bin:/bin")
+        path_dirs = set(path.split(os.pathsep))
         for extra in ["/usr/local/bin", os.path.expanduser("~/.local/bin")]:
-            if extra not in path:
-                path = f"{extra}:{path}"
+            if extra not in path_dirs:
+                path = f"{extra}{os.pathsep}{path}"
         env["PATH"] = path
         # HOME is needed by many tools
         if "HOME" not in env:
@@ -65,8 +447,141 @@ class ClaudeProcessor:
             env["PLANFIX_ACCOUNT"] = self.planfix_account
         if self.planfix_token:
             env["PLANFIX_TOKEN"] = self.planfix_token
+        self._subprocess_env = env
         return env
 
+    def _run_claude(
+        self,
+        prompt: str | Sequence[str | bytes],
+        *,
+        mcp: bool = False,
+        fast: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run one Claude CLI call with the prompt on stdin.
+
+        Args:
+            prompt: Full prompt text, or its parts in order. Static parts
+                can be passed pre-encoded and are written to stdin as-is.
+            mcp: Load the MCP servers from mcp-config.json.
+            fast: Use the configured fast model for short, tool-free calls,
+                so simple matching and summarizing don't wait on the
+                default (slower) model.
+            timeout: Seconds before subprocess.TimeoutExpired is raised.
+
+        Output is streamed into byte buffers as it arrives and decoded once
+        at the end, so a stray invalid byte can't fail the whole call.
+        """
+        cmd = ["claude", "--print", "--dangerously-skip-permissions"]
+        if mcp:
+            cmd += ["--mcp-config", str(self._mcp_config_path)]
+        if fast and self.fast_model:
+            cmd += ["--model", self.fast_model]
+
+        parts = (prompt,) if isinstance(prompt, str) else prompt
+        deadline = time.monotonic() + timeout
+        stdout = bytearray()
+        stderr = bytearray()
+        with subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.vault_path.parent,
+            env=self._build_subprocess_env(),
+            start_new_session=True,
+        ) as proc:
+            pumps = [
+                threading.Thread(target=target, args=args, daemon=True)
+                for target, args in (
+                    (_feed_stdin, (proc.stdin, parts)),
+                    (_drain_pipe, (proc.stdout, stdout, "stdout")),
+                    (_drain_pipe, (proc.stderr, stderr, "stderr", STDERR_TAIL_BYTES)),
+                )
+            ]
+            for pump in pumps:
+                pump.start()
+            try:
+                proc.wait(timeout=timeout)
+            finally:
+                # Kill what is left of the group, after a timeout or a normal
+                # exit alike: MCP servers spawned by the CLI would otherwise
+                # outlive it and keep the pipes open, so the pumps never end
+                _kill_process_group(proc.pid)
+                # A grandchild that left the group (setsid) can still hold
+                # the pipes; don't wait on it past the call's own deadline
+                # (plus a second for the pipes of killed processes to close)
+                for pump in pumps:
+                    pump.join(max(deadline - time.monotonic(), 1))
+                if any(pump.is_alive() for pump in pumps):
+                    logger.warning("Claude CLI pipes still held open after exit")
+                    # Popen's exit would block closing a pipe a pump is
+                    # still using; each pump closes its own pipe when done
+                    proc.stdin = proc.stdout = proc.stderr = None
+
+        return subprocess.CompletedProcess(
+            cmd,
+            proc.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    def _run_fast(self, prompt: str, timeout: int) -> str | None:
+        """Run a short tool-free prompt with the fast model.
+
+        Calls the Messages API directly when an API key is configured,
+        skipping CLI and MCP start-up; falls back to the CLI otherwise or
+        if the API call fails.
+
+        Returns:
+            Reply text, or None if the call failed.
+        """
+        if self._api_client:
+            try:
+                resp = self._api_client.post(
+                    "/v1/messages",
+                    json={
+                        "model": self.fast_model,
+                        "max_tokens": FAST_MAX_TOKENS,
+                        "messages": [{"role": "user", "content": prompt}],
+                    },
+                    timeout=timeout,
+                )
+                resp.raise_for_status()
+                return "".join(
+                    block["text"]
+                    for block in resp.json().get("content", [])
+                    if block.get("type") == "text"
+                ).strip()
+            except httpx.HTTPError as e:
+                logger.warning("Anthropic API call failed, using CLI: %s", e)
+
+        result = self._run_claude(prompt, fast=True, timeout=timeout)
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip()
+
+    def _read_cached(self, path: Path) -> str:
+        """Read a vault file, reusing the last read while it is unchanged.
+
+        Returns an empty string if the file doesn't exist.
+        """
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._file_cache.pop(path, None)
+            return ""
+        cached = self._file_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        text = path.read_bytes().decode("utf-8")
+        self._file_cache[path] = (st.st_mtime_ns, st.st_size, text)
+        return text
+
+    def _load_parallel(self, *loaders: Callable[[], str]) -> list[str]:
+        """Run prompt context loaders concurrently, results in argument order."""
+        return list(self._io_pool.map(lambda load: load(), loaders))
+
     def _load_skill_content(self) -> str:
         """Load dbrain-processor skill content for inclusion in prompt.
 
@@ -74,23 +589,21 @@ class ClaudeProcessor:
         so we must include skill content directly in the prompt.
         """
         skill_path = self.vault_path / ".claude/skills/dbrain-processor/SKILL.md"
-        if skill_path.exists():
-            return skill_path.read_text()
-        return ""
+        return self._read_cached(skill_path)
 
     def _load_ticktick_reference(self) -> str:
         """Load TickTick reference for inclusion in prompt."""
-        ref_path = self.vault_path / ".claude/skills/dbrain-processor/references/ticktick.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/dbrain-processor/references/ticktick.md"
+        )
+        return self._read_cached(ref_path)
 
     def _load_planfix_reference(self) -> str:
         """Load Planfix reference for inclusion in prompt."""
-        ref_path = self.vault_path / ".claude/skills/dbrain-processor/references/planfix.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/dbrain-processor/references/planfix.md"
+        )
+        return self._read_cached(ref_path)
 
     def _get_session_context(self, user_id: int) -> str:
         """Get today's session context for Claude.
@@ -104,11 +617,18 @@ class ClaudeProcessor:
         if user_id == 0:
             return ""
 
-        session = SessionStore(self.vault_path)
-        today_entries = session.get_today(user_id)
+        if self._session_store is None:
+            self._session_store = SessionStore(self.vault_path)
+        today_entries = self._session_store.get_today(user_id)
         if not today_entries:
             return ""
 
+        # Entries are append-only: same count and last ts means same context
+        count, last_ts = len(today_entries), today_entries[-1].get("ts", "")
+        cached = self._session_cache.get(user_id)
+        if cached and cached[0] == count and cached[1] == last_ts:
+            return cached[2]
+
         lines = ["=== TODAY'S SESSION ==="]
         for entry in today_entries[-10:]:
             ts = entry.get("ts", "")[11:16]  # HH:MM from ISO
@@ -117,82 +637,73 @@ class ClaudeProcessor:
             if text:
                 lines.append(f"{ts} [{entry_type}] {text}")
         lines.append("=== END SESSION ===\n")
-        return "\n".join(lines)
+        context = "\n".join(lines)
+        self._session_cache[user_id] = (count, last_ts, context)
+        return context
 
     def _html_to_markdown(self, html: str) -> str:
         """Convert Telegram HTML to Obsidian Markdown."""
-        import re
-
-        text = html
-        # <b>text</b> → **text**
-        text = re.sub(r"<b>(.*?)</b>", r"**\1**", text)
-        # <i>text</i> → *text*
-        text = re.sub(r"<i>(.*?)</i>", r"*\1*", text)
-        # <code>text</code> → `text`
-        text = re.sub(r"<code>(.*?)</code>", r"`\1`", text)
-        # <s>text</s> → ~~text~~
-        text = re.sub(r"<s>(.*?)</s>", r"~~\1~~", text)
-        # Remove <u> (no Markdown equivalent, just keep text)
-        text = re.sub(r"</?u>", "", text)
-        # <a href="url">text</a> → [text](url)
-        text = re.sub(r'<a href="([^"]+)">([^<]+)</a>', r"[\2](\1)", text)
-
-        return text
+        return _HTML_TO_MD_RE.sub(_html_to_md_repl, html)
 
     def _markdown_to_html(self, md: str) -> str:
         """Convert Obsidian Markdown back to Telegram HTML."""
-        import re
-
-        text = md
-        # **text** → <b>text</b>
-        text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-        # *text* → <i>text</i> (but not inside already-converted bold)
-        text = re.sub(r"(?<!\*)\*([^*]+?)\*(?!\*)", r"<i>\1</i>", text)
-        # `text` → <code>text</code>
-        text = re.sub(r"`([^`]+?)`", r"<code>\1</code>", text)
-        # ~~text~~ → <s>text</s>
-        text = re.sub(r"~~(.+?)~~", r"<s>\1</s>", text)
-        # [text](url) → <a href="url">text</a>
-        text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+        return markdown_to_html(md)
 
-        return text
+    def _save_week_note(
+        self,
+        subdir: str,
+        suffix: str,
+        kind: str,
+        html: str,
+        note_date: date,
+    ) -> Path:
+        """Save a Telegram HTML report as vault/<subdir>/YYYY-WXX-<suffix>.md.
+
+        The report is converted to Markdown for Obsidian and written under
+        date/type/week frontmatter.
+        """
+        # ISO week of the note date
+        year, week, _ = note_date.isocalendar()
+        week_id = f"{year}-W{week:02d}"
+        note_dir = self.vault_path / subdir
+        note_dir.mkdir(parents=True, exist_ok=True)
+        note_path = note_dir / f"{week_id}-{suffix}.md"
+
+        frontmatter = _WEEK_NOTE_FRONTMATTER.format(
+            date=note_date.isoformat(),
+            kind=kind,
+            week=week_id,
+        )
+        _write_note(note_path, frontmatter, self._html_to_markdown(html))
+        return note_path
 
     def _save_weekly_summary(self, report_html: str, week_date: date) -> Path:
         """Save weekly summary to vault/summaries/YYYY-WXX-summary.md."""
-        # Calculate ISO week number
-        year, week, _ = week_date.isocalendar()
-        filename = f"{year}-W{week:02d}-summary.md"
-        summary_path = self.vault_path / "summaries" / filename
-
-        # Convert HTML to Markdown for Obsidian
-        content = self._html_to_markdown(report_html)
-
-        # Add frontmatter
-        frontmatter = f"""---
-date: {week_date.isoformat()}
-type: weekly-summary
-week: {year}-W{week:02d}
----
-
-"""
-        summary_path.write_text(frontmatter + content)
+        summary_path = self._save_week_note(
+            "summaries",
+            "summary",
+            "weekly-summary",
+            report_html,
+            week_date,
+        )
         logger.info("Weekly summary saved to %s", summary_path)
         return summary_path
 
     def _update_weekly_moc(self, summary_path: Path) -> None:
         """Add link to new summary in MOC-weekly.md."""
         moc_path = self.vault_path / "MOC" / "MOC-weekly.md"
-        if moc_path.exists():
-            content = moc_path.read_text()
-            link = f"- [[summaries/{summary_path.name}|{summary_path.stem}]]"
-            # Insert after "## Previous Weeks" if not already there
-            if summary_path.stem not in content:
-                content = content.replace(
-                    "## Previous Weeks\n",
-                    f"## Previous Weeks\n\n{link}\n",
-                )
-                moc_path.write_text(content)
-                logger.info("Updated MOC-weekly.md with link to %s", summary_path.stem)
+        # Unchanged since the last digest: served from the file cache
+        content = self._read_cached(moc_path)
+        if not content or summary_path.stem in content:
+            return
+        # Insert after the first "## Previous Weeks" heading
+        insert_at = content.find(MOC_PREVIOUS_WEEKS)
+        if insert_at == -1:
+            return
+        insert_at += len(MOC_PREVIOUS_WEEKS)
+        link = f"- [[summaries/{summary_path.name}|{summary_path.stem}]]"
+        moc_path.write_text(f"{content[:insert_at]}\n{link}\n{content[insert_at:]}")
+        logger.info("Updated MOC-weekly.md with link to %s", summary_path.stem)
 
     def process_daily(self, day: date | None = None) -> dict[str, Any]:
         """Process daily file with Claude.
@@ -208,13 +719,23 @@ week: {year}-W{week:02d}
 
         daily_file = self.vault_path / "daily" / f"{day.isoformat()}.md"
 
-        if not daily_file.exists():
+        try:
+            daily_bytes = daily_file.read_bytes()
+        except FileNotFoundError:
             logger.warning("No daily file for %s", day)
             return {
                 "error": f"No daily file for {day}",
                 "processed_entries": 0,
             }
 
+        # Nothing but whitespace/frontmatter: skip the skill read and Claude call
+        if not _strip_frontmatter(daily_bytes).strip():
+            logger.info("Daily file for %s is empty, nothing to process", day)
+            return {
+                "report": f"📊 <b>Обработка за {day}</b>\n\nНет записей для обработки",
+                "processed_entries": 0,
+            }
+
         # Load skill content directly (@ references don't work in --print mode)
         skill_content = self._load_skill_content()
 
@@ -242,25 +763,7 @@ CRITICAL OUTPUT FORMAT:
 - If entries already processed, return status report in same HTML format"""
 
         try:
-            # Pass TickTick credentials + robust env to Claude subprocess
-            env = self._build_subprocess_env()
-
-            result = subprocess.run(
-                [
-                    "claude",
-                    "--print",
-                    "--dangerously-skip-permissions",
-                    "--mcp-config",
-                    str(self._mcp_config_path),
-                ],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-                env=env,
-            )
+            result = self._run_claude(prompt, mcp=True)
 
             if result.returncode != 0:
                 logger.error("Claude processing failed: %s", result.stderr)
@@ -308,67 +811,29 @@ CRITICAL OUTPUT FORMAT:
         today = date.today()
 
         # Load context
-        ticktick_ref = self._load_ticktick_reference()
-        planfix_ref = self._load_planfix_reference()
-        session_context = self._get_session_context(user_id)
-
-        prompt = f"""Ты - персональный ассистент d-brain.
-
-CONTEXT:
-- Текущая дата: {today}
-- Vault path: {self.vault_path}
-
-{session_context}=== TICKTICK REFERENCE ===
-{ticktick_ref}
-=== END REFERENCE ===
-
-=== PLANFIX REFERENCE ===
-{planfix_ref}
-=== END REFERENCE ===
-
-ПЕРВЫМ ДЕЛОМ: вызови mcp__ticktick__get_user_projects чтобы убедиться что MCP работает.
-
-CRITICAL MCP RULE:
-- ТЫ ИМЕЕШЬ ДОСТУП к mcp__ticktick__* tools И mcp__planfix__* tools — ВЫЗЫВАЙ ИХ НАПРЯМУЮ
-- НИКОГДА не пиши "MCP недоступен" или "добавь вручную"
-- Для ЛИЧНЫХ задач и менторства: mcp__ticktick__*
-- Для КОМАНДНЫХ задач (SMMEKALKA, C-GROWTH, KLEVERS): mcp__planfix__*
-- Если tool вернул ошибку — покажи ТОЧНУЮ ошибку в отчёте
-
-USER REQUEST:
-{user_prompt}
-
-CRITICAL OUTPUT FORMAT:
-- Return ONLY raw HTML for Telegram (parse_mode=HTML)
-- NO markdown: no **, no ##, no ```, no tables, no -
-- Start with emoji and <b>header</b>
-- Allowed tags: <b>, <i>, <code>, <s>, <u>
-- Be concise - Telegram has 4096 char limit
+        ticktick_ref, planfix_ref, session_context = self._load_parallel(
+            self._load_ticktick_reference,
+            self._load_planfix_reference,
+            partial(self._get_session_context, user_id),
+        )
 
-EXECUTION:
-1. Analyze the request
-2. Call MCP tools directly (mcp__ticktick__*, mcp__planfix__*, read/write files)
-3. Return HTML status report with results"""
+        # Only the dynamic parts are built per call; the rules are static
+        prompt = (
+            "Ты - персональный ассистент d-brain.\n\n"
+            f"CONTEXT:\n- Текущая дата: {today}\n- Vault path: {self.vault_path}\n\n",
+            session_context,
+            "=== TICKTICK REFERENCE ===\n",
+            ticktick_ref,
+            "\n=== END REFERENCE ===\n\n=== PLANFIX REFERENCE ===\n",
+            planfix_ref,
+            "\n=== END REFERENCE ===\n\n",
+            _EXECUTE_MCP_RULES,
+            f"USER REQUEST:\n{user_prompt}\n\n",
+            _EXECUTE_OUTPUT_RULES,
+        )
 
         try:
-            env = self._build_subprocess_env()
-
-            result = subprocess.run(
-                [
-                    "claude",
-                    "--print",
-                    "--dangerously-skip-permissions",
-                    "--mcp-config",
-                    str(self._mcp_config_path),
-                ],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-                env=env,
-            )
+            result = self._run_claude(prompt, mcp=True)
 
             if result.returncode != 0:
                 logger.error("Claude execution failed: %s", result.stderr)
@@ -425,24 +890,7 @@ CRITICAL OUTPUT FORMAT:
 - Be concise - Telegram has 4096 char limit"""
 
         try:
-            env = self._build_subprocess_env()
-
-            result = subprocess.run(
-                [
-                    "claude",
-                    "--print",
-                    "--dangerously-skip-permissions",
-                    "--mcp-config",
-                    str(self._mcp_config_path),
-                ],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-                env=env,
-            )
+            result = self._run_claude(prompt, mcp=True)
 
             if result.returncode != 0:
                 logger.error("Weekly digest failed: %s", result.stderr)
@@ -475,24 +923,13 @@ CRITICAL OUTPUT FORMAT:
             logger.exception("Unexpected error during weekly digest")
             return {"error": str(e), "processed_entries": 0}
 
-    def _summarize_meeting(self, name: str, text: str, cache_dir: Path | None = None) -> str:
+    def _summarize_meeting(self, name: str, text: str) -> str | None:
         """Summarize a long meeting transcript via Claude.
 
-        Caches the summary next to the original file so repeated
-        /content runs don't re-summarize the same meetings.
-
         Returns a concise summary with key insights, decisions, and
-        interesting thoughts — so nothing important is lost.
+        interesting thoughts — so nothing important is lost — or None
+        if summarizing failed.
         """
-        # Check cache first
-        if cache_dir:
-            cache_file = cache_dir / f"{name}.summary.md"
-            if cache_file.exists():
-                cached = cache_file.read_text()
-                if cached.strip():
-                    logger.info("Using cached summary for %s", name)
-                    return f"[SUMMARY]\n{cached}"
-
         prompt = (
             "Ты суммаризатор встреч. Извлеки из транскрипта ВСЕ ключевые мысли, "
             "решения, инсайты, интересные идеи и цитаты. Ничего важного не пропускай.\n\n"
@@ -501,30 +938,18 @@ CRITICAL OUTPUT FORMAT:
             f"=== TRANSCRIPT: {name} ===\n{text}"
         )
         try:
-            result = subprocess.run(
-                ["claude", "--print", "--dangerously-skip-permissions"],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                check=False,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                summary = result.stdout.strip()
-                logger.info("Summarized meeting %s: %d → %d chars", name, len(text), len(summary))
-                # Save to cache
-                if cache_dir:
-                    try:
-                        cache_file = cache_dir / f"{name}.summary.md"
-                        cache_file.write_text(summary)
-                    except Exception as e:
-                        logger.warning("Failed to cache summary for %s: %s", name, e)
-                return f"[SUMMARY]\n{summary}"
+            summary = self._run_fast(prompt, timeout=300)
+            if summary:
+                logger.info(
+                    "Summarized meeting %s: %d → %d chars",
+                    name,
+                    len(text),
+                    len(summary),
+                )
+                return summary
         except Exception as e:
             logger.warning("Failed to summarize meeting %s: %s", name, e)
-        # Fallback: return original text (stdin handles large prompts)
-        return text
+        return None
 
     def _collect_raw_material(self, days: int = 7) -> str:
         """Collect raw material from vault for content seed generation.
@@ -539,56 +964,112 @@ CRITICAL OUTPUT FORMAT:
             Combined text of all raw material.
         """
         today = date.today()
-        parts: list[str] = []
+        cutoff = (today - timedelta(days=days)).isoformat()
+        daily_names = {
+            f"{(today - timedelta(days=i)).isoformat()}.md" for i in range(days)
+        }
+        meetings_dir = self._meetings_dir
+
+        # One listing per directory; dates are filtered on the file names
+        sources = [
+            ("DAILY", entry)
+            for entry in _md_entries_newest_first(self._daily_dir)
+            if entry.name in daily_names
+        ]
+        sources += [
+            ("MEETING", entry)
+            for entry in _dated_md_entries(meetings_dir, cutoff)
+            if not entry.name.endswith(".summary.md")  # skip cached summaries
+        ]
+        sources += [
+            ("THOUGHT", entry)
+            for entry in _dated_md_entries(self._thoughts_dir, cutoff)
+        ]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            contents = list(pool.map(lambda src: _read_text(src[1].path), sources))
+
+        # Pick meeting transcripts to summarize: all long ones, then the
+        # largest remaining ones while the material is over budget and
+        # summarizing them can still bring it back under
+        total = sum(len(content) for content in contents)
+        meetings = sorted(
+            (
+                i
+                for i, (kind, _) in enumerate(sources)
+                if kind == "MEETING" and len(contents[i]) > MEETING_SUMMARY_FLOOR
+            ),
+            key=lambda i: len(contents[i]),
+            reverse=True,
+        )
+        savings = [
+            len(contents[i]) - min(len(contents[i]), MEETING_SUMMARY_ESTIMATE)
+            for i in meetings
+        ]
+        remaining = sum(savings)
+        selected: list[int] = []
+        for i, saving in zip(meetings, savings, strict=True):
+            if len(contents[i]) <= MEETING_SUMMARY_CHARS and (
+                total <= RAW_MATERIAL_BUDGET
+                or total - remaining > RAW_MATERIAL_BUDGET
+                or not saving
+            ):
+                break
+            selected.append(i)
+            total -= saving
+            remaining -= saving
+
+        # Summaries are cached in one index keyed by meeting name and
+        # invalidated by the file's mtime, so repeated /content runs don't
+        # re-summarize the same meetings.
+        index = _load_summary_index(meetings_dir)
+        index_changed = False
+        to_summarize: list[tuple[int, str, int]] = []
+        for i in sorted(selected):
+            entry = sources[i][1]
+            name, mtime_ns = entry.name[:-3], entry.stat().st_mtime_ns
+            cached = index.get(name)
+            if not cached:
+                # Summaries cached by older versions as <name>.summary.md
+                legacy = _read_text(os.path.join(meetings_dir, f"{name}.summary.md"))
+                if legacy.strip():
+                    cached = index[name] = {"mtime_ns": mtime_ns, "summary": legacy}
+                    index_changed = True
+            if cached and cached["mtime_ns"] == mtime_ns:
+                logger.info("Using cached summary for %s", name)
+                contents[i] = f"[SUMMARY]\n{cached['summary']}"
+            else:
+                to_summarize.append((i, name, mtime_ns))
 
-        # Collect daily files
-        daily_dir = self.vault_path / "daily"
-        if daily_dir.exists():
-            for i in range(days):
-                day = today - timedelta(days=i)
-                daily_file = daily_dir / f"{day.isoformat()}.md"
-                if daily_file.exists():
-                    content = daily_file.read_text()
-                    if content.strip():
-                        parts.append(f"=== DAILY {day.isoformat()} ===\n{content}")
-
-        # Collect meeting transcripts — summarize large ones (with cache)
-        meetings_dir = self.vault_path / "content" / "meetings"
-        if meetings_dir.exists():
-            cutoff = today - timedelta(days=days)
-            for md_file in sorted(meetings_dir.glob("*.md"), reverse=True):
-                if md_file.name.endswith(".summary.md"):
-                    continue  # skip cached summaries
-                try:
-                    file_date = date.fromisoformat(md_file.name[:10])
-                    if file_date >= cutoff:
-                        content = md_file.read_text()
-                        if content.strip():
-                            if len(content) > 5000:
-                                content = self._summarize_meeting(
-                                    md_file.stem, content, cache_dir=meetings_dir,
-                                )
-                            parts.append(
-                                f"=== MEETING {md_file.stem} ===\n{content}"
-                            )
-                except ValueError:
-                    continue
-
-        # Collect thoughts
-        thoughts_dir = self.vault_path / "thoughts"
-        if thoughts_dir.exists():
-            cutoff = today - timedelta(days=days)
-            for md_file in sorted(thoughts_dir.glob("*.md"), reverse=True):
-                try:
-                    file_date = date.fromisoformat(md_file.name[:10])
-                    if file_date >= cutoff:
-                        content = md_file.read_text()
-                        if content.strip():
-                            parts.append(
-                                f"=== THOUGHT {md_file.stem} ===\n{content}"
-                            )
-                except ValueError:
-                    continue
+        # Each summary is its own Claude process, so a few run side by side
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SUMMARIES) as pool:
+            summaries = pool.map(
+                lambda item: self._summarize_meeting(item[1], contents[item[0]]),
+                to_summarize,
+            )
+            for (i, name, mtime_ns), summary in zip(
+                to_summarize,
+                summaries,
+                strict=True,
+            ):
+                # On failure the original text is kept (stdin handles large prompts)
+                if summary:
+                    index[name] = {"mtime_ns": mtime_ns, "summary": summary}
+                    index_changed = True
+                    contents[i] = f"[SUMMARY]\n{summary}"
+
+        if index_changed:
+            _save_summary_index(meetings_dir, index)
+
+        parts: list[str] = []
+        for (kind, entry), content in zip(sources, contents, strict=True):
+            if content.strip():
+                if len(content) > RAW_SOURCE_MAX_CHARS:
+                    cut = len(content) - RAW_SOURCE_MAX_CHARS
+                    content = (
+                        f"{content[:RAW_SOURCE_MAX_CHARS]}\n…[truncated {cut} chars]"
+                    )
+                parts.append(f"=== {kind} {entry.name[:-3]} ===\n{content}")
 
         if not parts:
             return ""
@@ -597,65 +1078,53 @@ CRITICAL OUTPUT FORMAT:
 
     def _save_content_seeds(self, html: str, seeds_date: date) -> Path:
         """Save content seeds to vault/content/seeds/YYYY-WXX-seeds.md."""
-        year, week, _ = seeds_date.isocalendar()
-        filename = f"{year}-W{week:02d}-seeds.md"
-        seeds_dir = self.vault_path / "content" / "seeds"
-        seeds_dir.mkdir(parents=True, exist_ok=True)
-        seeds_path = seeds_dir / filename
-
-        content = self._html_to_markdown(html)
-        frontmatter = f"""---
-date: {seeds_date.isoformat()}
-type: content-seeds
-week: {year}-W{week:02d}
----
-
-"""
-        seeds_path.write_text(frontmatter + content)
+        seeds_path = self._save_week_note(
+            "content/seeds",
+            "seeds",
+            "content-seeds",
+            html,
+            seeds_date,
+        )
         logger.info("Content seeds saved to %s", seeds_path)
         return seeds_path
 
     def _load_content_seeds_skill(self) -> str:
         """Load content-seeds skill content."""
         skill_path = self.vault_path / ".claude/skills/content-seeds/SKILL.md"
-        if skill_path.exists():
-            return skill_path.read_text()
-        return ""
+        return self._read_cached(skill_path)
 
     def _load_humanizer_reference(self) -> str:
         """Load humanizer reference for content quality."""
-        ref_path = self.vault_path / ".claude/skills/content-seeds/references/humanizer.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/content-seeds/references/humanizer.md"
+        )
+        return self._read_cached(ref_path)
 
     def _load_tone_of_voice(self) -> str:
         """Load combined tone of voice + humanizer reference."""
-        ref_path = self.vault_path / ".claude/skills/content-seeds/references/tone-of-voice.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/content-seeds/references/tone-of-voice.md"
+        )
+        return self._read_cached(ref_path)
 
     def _load_strategy(self) -> str:
         """Load content strategy reference."""
-        ref_path = self.vault_path / ".claude/skills/content-seeds/references/strategy.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/content-seeds/references/strategy.md"
+        )
+        return self._read_cached(ref_path)
 
     def _load_icp(self) -> str:
         """Load ICP & positioning reference."""
         ref_path = self.vault_path / ".claude/skills/content-seeds/references/icp.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        return self._read_cached(ref_path)
 
     def _load_tone_examples(self) -> str:
         """Load tone of voice examples from real channel posts."""
-        ref_path = self.vault_path / ".claude/skills/content-seeds/references/tone-examples.md"
-        if ref_path.exists():
-            return ref_path.read_text()
-        return ""
+        ref_path = (
+            self.vault_path / ".claude/skills/content-seeds/references/tone-examples.md"
+        )
+        return self._read_cached(ref_path)
 
     def generate_content_seeds(self) -> dict[str, Any]:
         """Generate content seeds from weekly raw material.
@@ -665,73 +1134,50 @@ week: {year}-W{week:02d}
         """
         today = date.today()
 
-        # Load skill and references
-        skill_content = self._load_content_seeds_skill()
-        tone_of_voice = self._load_tone_of_voice()
-        strategy = self._load_strategy()
-        icp = self._load_icp()
-        tone_examples = self._load_tone_examples()
-
-        # Collect raw material in Python (more reliable than asking Claude to read files)
-        raw_material = self._collect_raw_material(days=7)
+        # Load skill and references; collect raw material in Python
+        # (more reliable than asking Claude to read files)
+        (
+            skill_content,
+            tone_of_voice,
+            strategy,
+            icp,
+            tone_examples,
+            raw_material,
+        ) = self._load_parallel(
+            self._load_content_seeds_skill,
+            self._load_tone_of_voice,
+            self._load_strategy,
+            self._load_icp,
+            self._load_tone_examples,
+            partial(self._collect_raw_material, days=7),
+        )
         if not raw_material:
             return {
                 "error": "Нет записей за последние 7 дней для генерации seeds",
                 "processed_entries": 0,
             }
 
-        # Build references section
-        references = ""
-        if tone_of_voice:
-            references += f"\n=== TONE OF VOICE & HUMANIZER ===\n{tone_of_voice}\n=== END TONE OF VOICE ===\n"
-        if strategy:
-            references += f"\n=== CONTENT STRATEGY ===\n{strategy}\n=== END STRATEGY ===\n"
-        if icp:
-            references += f"\n=== ICP & POSITIONING ===\n{icp}\n=== END ICP ===\n"
+        references = _plan_references(tone_of_voice, strategy, icp)
         if tone_examples:
-            references += f"\n=== TONE OF VOICE EXAMPLES ===\n{tone_examples}\n=== END TONE EXAMPLES ===\n"
-
-        prompt = f"""Сегодня {today}. Сгенерируй content seeds из сырого материала.
-
-=== SKILL INSTRUCTIONS ===
-{skill_content}
-=== END SKILL ===
-{references}
-=== RAW MATERIAL (last 7 days) ===
-{raw_material}
-=== END RAW MATERIAL ===
-
-CRITICAL OUTPUT FORMAT:
-- Return ONLY raw HTML for Telegram (parse_mode=HTML)
-- NO markdown: no **, no ##, no ```, no tables
-- Allowed tags: <b>, <i>, <code>, <s>, <u>
-- Follow the output format from SKILL INSTRUCTIONS exactly
+            references.append(
+                f"\n=== TONE OF VOICE EXAMPLES ===\n{tone_examples}\n"
+                "=== END TONE EXAMPLES ===\n"
+            )
 
-CRITICAL RULES:
-- Оценивай seeds по матрице из CONTENT STRATEGY (арка, функция, тон)
-- Каждый seed ОБЯЗАН принадлежать одной из 3 нарративных арок
-- Целься в конкретный сегмент ICP - кто прочтёт и кивнёт?
-- Применяй ВСЕ правила из TONE OF VOICE (голос Марины + анти-AI фильтр)
-- Каждый hook проверяй на AI-паттерны перед выдачей
-- Пиши как живой человек, не как ChatGPT"""
+        # Parts are streamed to the CLI without being joined
+        prompt: tuple[str | bytes, ...] = (
+            f"Сегодня {today}. Сгенерируй content seeds из сырого материала.\n\n"
+            "=== SKILL INSTRUCTIONS ===\n",
+            skill_content,
+            "\n=== END SKILL ===\n",
+            *references,
+            "\n=== RAW MATERIAL (last 7 days) ===\n",
+            raw_material,
+            _SEEDS_RULES,
+        )
 
         try:
-            env = self._build_subprocess_env()
-
-            result = subprocess.run(
-                [
-                    "claude",
-                    "--print",
-                    "--dangerously-skip-permissions",
-                ],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-                env=env,
-            )
+            result = self._run_claude(prompt)
 
             if result.returncode != 0:
                 logger.error("Content seeds generation failed: %s", result.stderr)
@@ -755,7 +1201,10 @@ CRITICAL RULES:
 
         except subprocess.TimeoutExpired:
             logger.error("Content seeds generation timed out")
-            return {"error": "Content seeds generation timed out", "processed_entries": 0}
+            return {
+                "error": "Content seeds generation timed out",
+                "processed_entries": 0,
+            }
         except FileNotFoundError:
             logger.error("Claude CLI not found")
             return {"error": "Claude CLI not installed", "processed_entries": 0}
@@ -769,53 +1218,55 @@ CRITICAL RULES:
         Reads up to max_weeks of seed files so unused seeds
         carry over and can be selected in future plans.
         """
-        seeds_dir = self.vault_path / "content" / "seeds"
-        if not seeds_dir.exists():
-            return ""
-        seed_files = sorted(seeds_dir.glob("*.md"), reverse=True)[:max_weeks]
-        if not seed_files:
+        seed_entries = _md_entries_newest_first(self._seeds_dir, max_weeks)
+        if not seed_entries:
             return ""
+
+        # Reuse the joined text while the same files are unchanged
+        key = tuple(
+            (entry.name, st.st_mtime_ns, st.st_size)
+            for entry in seed_entries
+            for st in (entry.stat(),)
+        )
+        cached = self._all_seeds_cache.get(max_weeks)
+        if cached and cached[0] == key:
+            return cached[1]
+
         parts = []
-        for f in seed_files:
-            parts.append(f"=== {f.stem} ===\n{f.read_text()}")
-        return "\n\n".join(parts)
+        for entry in seed_entries:
+            content = self._read_cached(Path(entry.path))
+            parts.append(f"=== {entry.name[:-3]} ===\n{content}")
+        text = "\n\n".join(parts)
+        self._all_seeds_cache[max_weeks] = (key, text)
+        return text
 
     def _load_content_planner_skill(self) -> str:
         """Load content-planner skill content."""
         skill_path = self.vault_path / ".claude/skills/content-planner/SKILL.md"
-        if skill_path.exists():
-            return skill_path.read_text()
-        return ""
+        return self._read_cached(skill_path)
 
     def _load_monthly_goals(self) -> str:
         """Load current monthly goals for content alignment."""
         goals_path = self.vault_path / "goals" / "2-monthly.md"
-        if goals_path.exists():
-            return goals_path.read_text()
-        return ""
+        return self._read_cached(goals_path)
 
     def _save_content_plan(self, html: str, plan_date: date) -> Path:
         """Save content plan to vault/content/plans/YYYY-WXX-plan.md."""
-        year, week, _ = plan_date.isocalendar()
-        filename = f"{year}-W{week:02d}-plan.md"
-        plans_dir = self.vault_path / "content" / "plans"
-        plans_dir.mkdir(parents=True, exist_ok=True)
-        plan_path = plans_dir / filename
-
-        content = self._html_to_markdown(html)
-        frontmatter = f"""---
-date: {plan_date.isoformat()}
-type: content-plan
-week: {year}-W{week:02d}
----
-
-"""
-        plan_path.write_text(frontmatter + content)
+        plan_path = self._save_week_note(
+            "content/plans",
+            "plan",
+            "content-plan",
+            html,
+            plan_date,
+        )
+        self._plan_cache.pop(plan_path, None)
         logger.info("Content plan saved to %s", plan_path)
         return plan_path
 
     def generate_content_plan(
-        self, channel_posts: str = "", target_date: date | None = None,
+        self,
+        channel_posts: str = "",
+        target_date: date | None = None,
     ) -> dict[str, Any]:
         """Generate weekly content plan from seeds and channel history.
 
@@ -829,12 +1280,21 @@ week: {year}-W{week:02d}
         today = target_date or date.today()
 
         # Load skill and context
-        skill_content = self._load_content_planner_skill()
-        tone_of_voice = self._load_tone_of_voice()
-        strategy = self._load_strategy()
-        icp = self._load_icp()
-        seeds_content = self._load_all_seeds()
-        monthly_goals = self._load_monthly_goals()
+        (
+            skill_content,
+            tone_of_voice,
+            strategy,
+            icp,
+            seeds_content,
+            monthly_goals,
+        ) = self._load_parallel(
+            self._load_content_planner_skill,
+            self._load_tone_of_voice,
+            self._load_strategy,
+            self._load_icp,
+            self._load_all_seeds,
+            self._load_monthly_goals,
+        )
 
         if not seeds_content:
             return {
@@ -854,57 +1314,23 @@ week: {year}-W{week:02d}
             )
         extra_context = "\n\n".join(context_parts)
 
-        # Build references
-        references = ""
-        if tone_of_voice:
-            references += f"\n=== TONE OF VOICE & HUMANIZER ===\n{tone_of_voice}\n=== END TONE OF VOICE ===\n"
-        if strategy:
-            references += f"\n=== CONTENT STRATEGY ===\n{strategy}\n=== END STRATEGY ===\n"
-        if icp:
-            references += f"\n=== ICP & POSITIONING ===\n{icp}\n=== END ICP ===\n"
-
-        prompt = f"""Сегодня {today}. Составь контент-план на неделю.
-
-=== SKILL INSTRUCTIONS ===
-{skill_content}
-=== END SKILL ===
-{references}
-=== CONTENT SEEDS ===
-{seeds_content}
-=== END CONTENT SEEDS ===
-
-{extra_context}
-
-CRITICAL OUTPUT FORMAT:
-- Return ONLY raw HTML for Telegram (parse_mode=HTML)
-- NO markdown: no **, no ##, no ```, no tables
-- Allowed tags: <b>, <i>, <code>, <s>, <u>
-- Follow the output format from SKILL INSTRUCTIONS exactly
-
-CRITICAL RULES:
-- Чередуй нарративные арки по правилам CONTENT STRATEGY
-- Проверяй последние посты канала - не повторять тему
-- Каждый пост целься в конкретный сегмент ICP
-- Все hooks пиши живым языком по правилам TONE OF VOICE
-- Никакого AI-стиля, канцелярита, шаблонных переходов"""
+        # Stable blocks (skill, references, seeds) go first so the prompt
+        # prefix is identical across calls; date and channel posts go last.
+        # The parts are streamed to the CLI without being joined.
+        prompt: tuple[str | bytes, ...] = (
+            "Составь контент-план на неделю.\n\n=== SKILL INSTRUCTIONS ===\n",
+            skill_content,
+            "\n=== END SKILL ===\n",
+            *_plan_references(tone_of_voice, strategy, icp),
+            "\n=== CONTENT SEEDS ===\n",
+            seeds_content,
+            f"\n=== END CONTENT SEEDS ===\n\nСегодня {today}.\n\n",
+            extra_context,
+            _PLAN_GENERATE_RULES,
+        )
 
         try:
-            env = self._build_subprocess_env()
-
-            result = subprocess.run(
-                [
-                    "claude",
-                    "--print",
-                    "--dangerously-skip-permissions",
-                ],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-                env=env,
-            )
+            result = self._run_claude(prompt)
 
             if result.returncode != 0:
                 logger.error("Content plan generation failed: %s", result.stderr)
@@ -928,7 +1354,10 @@ CRITICAL RULES:
 
         except subprocess.TimeoutExpired:
             logger.error("Content plan generation timed out")
-            return {"error": "Content plan generation timed out", "processed_entries": 0}
+            return {
+                "error": "Content plan generation timed out",
+                "processed_entries": 0,
+            }
         except FileNotFoundError:
             logger.error("Claude CLI not found")
             return {"error": "Claude CLI not installed", "processed_entries": 0}
@@ -944,59 +1373,70 @@ CRITICAL RULES:
         Returns:
             List of dicts: {"week", "num", "title", "full_text"}.
         """
-        import re
-
-        seeds_dir = self.vault_path / "content" / "seeds"
-        if not seeds_dir.exists():
-            return []
-
-        seed_files = sorted(seeds_dir.glob("*.md"), reverse=True)[:8]
+        seed_entries = _md_entries_newest_first(self._seeds_dir, 8)
         results: list[dict] = []
 
-        for f in seed_files:
-            if f.name == ".gitkeep":
-                continue
-            content = f.read_text()
+        for f in seed_entries:
+            # Shares the cache with _load_all_seeds; unchanged files aren't re-read
+            content = self._read_cached(Path(f.path))
             # Extract week from frontmatter or filename
             week = ""
-            week_match = re.search(r"week:\s*(\S+)", content)
+            week_match = _WEEK_FIELD_RE.search(content)
             if week_match:
                 week = week_match.group(1)
             else:
                 # Try filename: 2026-W07-seeds.md
-                fname_match = re.match(r"(\d{4}-W\d{2})", f.name)
+                fname_match = _SEED_WEEK_FILENAME_RE.match(f.name)
                 if fname_match:
                     week = fname_match.group(1)
 
-            # Strip frontmatter for content parsing
-            body = content
-            if body.startswith("---"):
-                end = body.find("---", 3)
+            # Skip frontmatter by offset instead of copying the body
+            body_start = 0
+            if content.startswith("---"):
+                end = content.find("---", 3)
                 if end != -1:
-                    body = body[end + 3:].strip()
+                    body_start = end + 3
 
-            # Find all seeds: "Seed #N: title" or "**Seed #N: title**"
-            seed_pattern = re.compile(
-                r"\*{0,2}Seed\s*#(\d+)[:\s]+(.+?)\*{0,2}\s*$", re.MULTILINE,
-            )
             # Split body into seed blocks
-            seed_starts = list(seed_pattern.finditer(body))
+            seed_starts = list(_SEED_HEADING_RE.finditer(content, body_start))
             for i, m in enumerate(seed_starts):
                 num = int(m.group(1))
-                title = m.group(2).strip().rstrip("*")
+                title = m.group(2).rstrip().rstrip("*").strip()
                 # Full text = from this match to next seed or end
                 start = m.start()
-                end_pos = seed_starts[i + 1].start() if i + 1 < len(seed_starts) else len(body)
-                full_text = body[start:end_pos].strip()
-                results.append({
-                    "week": week,
-                    "num": num,
-                    "title": title,
-                    "full_text": full_text,
-                })
+                end_pos = (
+                    seed_starts[i + 1].start()
+                    if i + 1 < len(seed_starts)
+                    else len(content)
+                )
+                full_text = content[start:end_pos].strip()
+                results.append(
+                    {
+                        "week": week,
+                        "num": num,
+                        "title": title,
+                        "full_text": full_text,
+                    }
+                )
 
         return results
 
+    def get_seed_text(self, week: str, num: int) -> str | None:
+        """Get full text of a single seed.
+
+        Args:
+            week: Seed week label (e.g. 2026-W07).
+            num: Seed number within the week.
+
+        Returns:
+            Seed markdown, or None if not found.
+        """
+        for seed in self._extract_seed_titles():
+            if seed["week"] == week and seed["num"] == num:
+                text: str = seed["full_text"]
+                return text
+        return None
+
     def get_current_plan(self, week_offset: int = 0) -> dict[str, Any]:
         """Read plan file for current (or offset) week.
 
@@ -1012,15 +1452,23 @@ CRITICAL RULES:
         filename = f"{week_id}-plan.md"
         plan_path = self.vault_path / "content" / "plans" / filename
 
-        if not plan_path.exists():
+        try:
+            st = plan_path.stat()
+        except FileNotFoundError:
+            self._plan_cache.pop(plan_path, None)
             return {"error": f"План на {week_id} не найден"}
 
-        content = plan_path.read_text()
-        # Strip frontmatter
-        if content.startswith("---"):
-            end = content.find("---", 3)
-            if end != -1:
-                content = content[end + 3:].strip()
+        cached = self._plan_cache.get(plan_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            content = cached[2]
+        else:
+            content = plan_path.read_text()
+            # Strip frontmatter
+            if content.startswith("---"):
+                end = content.find("---", 3)
+                if end != -1:
+                    content = content[end + 3 :].strip()
+            self._plan_cache[plan_path] = (st.st_mtime_ns, st.st_size, content)
 
         return {"plan": content, "week": week_id, "path": str(plan_path)}
 
@@ -1036,25 +1484,38 @@ CRITICAL RULES:
         return self.vault_path / "content" / "seeds" / ".dismissed.json"
 
     def _load_dismissed(self) -> set[str]:
-        """Load set of dismissed seed keys like '2026-W07:3'."""
-        import json
+        """Load set of dismissed seed keys like '2026-W07:3'.
 
-        if not self._dismissed_path.exists():
+        The parsed set is reused while the file's mtime is unchanged.
+        """
+        path = self._dismissed_path
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
             return set()
+        cached = self._dismissed_cache
+        if cached and cached[0] == mtime_ns:
+            return set(cached[1])
         try:
-            data = json.loads(self._dismissed_path.read_text())
-            return set(data.get("dismissed", []))
+            data = json.loads(path.read_bytes())
+            dismissed = frozenset(data.get("dismissed", []))
         except Exception:
             return set()
+        self._dismissed_cache = (mtime_ns, dismissed)
+        return set(dismissed)
 
     def _save_dismissed(self, dismissed: set[str]) -> None:
         """Save dismissed seed keys."""
-        import json
-
-        self._dismissed_path.parent.mkdir(parents=True, exist_ok=True)
-        self._dismissed_path.write_text(
-            json.dumps({"dismissed": sorted(dismissed)}, ensure_ascii=False, indent=2),
+        path = self._dismissed_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(
+            json.dumps(
+                {"dismissed": sorted(dismissed)},
+                ensure_ascii=False,
+                indent=2,
+            ).encode("utf-8"),
         )
+        self._dismissed_cache = (path.stat().st_mtime_ns, frozenset(dismissed))
 
     def dismiss_seeds(self, seeds_to_dismiss: list[dict]) -> int:
         """Mark seeds as dismissed. Returns count of newly dismissed."""
@@ -1065,7 +1526,8 @@ CRITICAL RULES:
             if key not in dismissed:
                 dismissed.add(key)
                 count += 1
-        self._save_dismissed(dismissed)
+        if count:
+            self._save_dismissed(dismissed)
         return count
 
     def list_unpublished_seeds(self, channel_posts: str) -> dict[str, Any]:
@@ -1087,13 +1549,14 @@ CRITICAL RULES:
         # Filter out dismissed seeds
         dismissed = self._load_dismissed()
         active_seeds = [
-            s for s in all_seeds
-            if f"{s['week']}:{s['num']}" not in dismissed
+            s for s in all_seeds if f"{s['week']}:{s['num']}" not in dismissed
         ]
         dismissed_count = len(all_seeds) - len(active_seeds)
 
         if not active_seeds:
-            return {"error": "Все seeds удалены или опубликованы. Запусти /content для новых."}
+            return {
+                "error": "Все seeds удалены или опубликованы. Запусти /content для новых."
+            }
 
         # Build compact title list for Claude (only active seeds)
         titles_text = "\n".join(
@@ -1122,21 +1585,17 @@ CRITICAL RULES:
 Ничего больше не пиши."""
 
         try:
-            result = subprocess.run(
-                ["claude", "--print", "--dangerously-skip-permissions"],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                check=False,
+            # Without posts nothing can be published: skip the Claude call
+            reply = (
+                self._run_fast(prompt, timeout=120) if channel_posts.strip() else None
             )
 
             published_indices: set[int] = set()
-            if result.returncode == 0 and result.stdout.strip().lower() != "none":
-                import re
-                numbers = re.findall(r"\d+", result.stdout.strip())
-                published_indices = {int(n) for n in numbers if 1 <= int(n) <= len(active_seeds)}
+            if reply and reply.lower() != "none":
+                n_active = len(active_seeds)
+                published_indices = {
+                    n for n in map(int, _NUMBER_RE.findall(reply)) if 1 <= n <= n_active
+                }
 
             # Build result: only unpublished
             unpublished = []
@@ -1177,49 +1636,27 @@ CRITICAL RULES:
         if "error" in plan_data:
             return plan_data
 
-        tone_of_voice = self._load_tone_of_voice()
-        strategy = self._load_strategy()
-
-        prompt = f"""Сравни контент-план с опубликованными постами канала.
-
-=== КОНТЕНТ-ПЛАН ({plan_data['week']}) ===
-{plan_data['plan']}
-=== END PLAN ===
-
-=== ПОСТЫ КАНАЛА ===
-{channel_posts}
-=== END POSTS ===
-
-=== TONE OF VOICE & HUMANIZER ===
-{tone_of_voice}
-=== END TONE OF VOICE ===
-
-=== CONTENT STRATEGY ===
-{strategy}
-=== END STRATEGY ===
-
-ЗАДАЧА:
-1. Определи какие посты из плана уже опубликованы - отметь их ✅
-2. Для неопубликованных - оставь как есть или скорректируй если нужно
-3. Проверь чередование арок по правилам CONTENT STRATEGY
-4. Верни полный обновлённый план
+        tone_of_voice, strategy = self._load_parallel(
+            self._load_tone_of_voice,
+            self._load_strategy,
+        )
 
-CRITICAL OUTPUT FORMAT:
-- Return ONLY raw HTML for Telegram (parse_mode=HTML)
-- NO markdown: no **, no ##, no ```, no tables
-- Allowed tags: <b>, <i>, <code>, <s>, <u>
-- Все hooks пиши живым языком по правилам TONE OF VOICE"""
+        # References first, plan and channel posts last (stable prompt prefix)
+        prompt = (
+            "Сравни контент-план с опубликованными постами канала.\n\n"
+            "=== TONE OF VOICE & HUMANIZER ===\n",
+            tone_of_voice,
+            "\n=== END TONE OF VOICE ===\n\n=== CONTENT STRATEGY ===\n",
+            strategy,
+            f"\n=== END STRATEGY ===\n\n=== КОНТЕНТ-ПЛАН ({plan_data['week']}) ===\n",
+            plan_data["plan"],
+            "\n=== END PLAN ===\n\n=== ПОСТЫ КАНАЛА ===\n",
+            channel_posts,
+            _PLAN_RECONCILE_RULES,
+        )
 
         try:
-            result = subprocess.run(
-                ["claude", "--print", "--dangerously-skip-permissions"],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-            )
+            result = self._run_claude(prompt)
 
             if result.returncode != 0:
                 return {
@@ -1256,54 +1693,27 @@ CRITICAL OUTPUT FORMAT:
         if "error" in plan_data:
             return plan_data
 
-        seeds_content = self._load_all_seeds(max_weeks=4)
-        tone_of_voice = self._load_tone_of_voice()
-        strategy = self._load_strategy()
-        icp = self._load_icp()
-
-        # Build references
-        references = ""
-        if tone_of_voice:
-            references += f"\n=== TONE OF VOICE & HUMANIZER ===\n{tone_of_voice}\n=== END TONE OF VOICE ===\n"
-        if strategy:
-            references += f"\n=== CONTENT STRATEGY ===\n{strategy}\n=== END STRATEGY ===\n"
-        if icp:
-            references += f"\n=== ICP & POSITIONING ===\n{icp}\n=== END ICP ===\n"
-
-        prompt = f"""Отредактируй контент-план по запросу пользователя.
-
-=== ТЕКУЩИЙ ПЛАН ({plan_data['week']}) ===
-{plan_data['plan']}
-=== END PLAN ===
-
-=== ДОСТУПНЫЕ SEEDS ===
-{seeds_content}
-=== END SEEDS ===
-{references}
-ЗАПРОС ПОЛЬЗОВАТЕЛЯ: {user_request}
-
-ЗАДАЧА:
-- Внеси запрошенные изменения в план
-- Сохрани общую структуру плана (дни, форматы, LinkedIn)
-- Используй seeds из списка если нужно заменить/добавить контент
-- Чередуй арки по правилам CONTENT STRATEGY
-- Все hooks пиши живым языком по правилам TONE OF VOICE
+        seeds_content, tone_of_voice, strategy, icp = self._load_parallel(
+            partial(self._load_all_seeds, max_weeks=4),
+            self._load_tone_of_voice,
+            self._load_strategy,
+            self._load_icp,
+        )
 
-CRITICAL OUTPUT FORMAT:
-- Return the FULL updated plan in raw HTML for Telegram
-- NO markdown: no **, no ##, no ```, no tables
-- Allowed tags: <b>, <i>, <code>, <s>, <u>"""
+        # References and seeds first, plan and request last (stable prompt prefix)
+        prompt = (
+            "Отредактируй контент-план по запросу пользователя.\n",
+            *_plan_references(tone_of_voice, strategy, icp),
+            "\n=== ДОСТУПНЫЕ SEEDS ===\n",
+            seeds_content,
+            f"\n=== END SEEDS ===\n\n=== ТЕКУЩИЙ ПЛАН ({plan_data['week']}) ===\n",
+            plan_data["plan"],
+            f"\n=== END PLAN ===\n\nЗАПРОС ПОЛЬЗОВАТЕЛЯ: {user_request}",
+            _PLAN_EDIT_RULES,
+        )
 
         try:
-            result = subprocess.run(
-                ["claude", "--print", "--dangerously-skip-permissions"],
-                input=prompt,
-                cwd=self.vault_path.parent,
-                capture_output=True,
-                text=True,
-                timeout=DEFAULT_TIMEOUT,
-                check=False,
-            )
+            result = self._run_claude(prompt)
 
             if result.returncode != 0:
                 return {
@@ -5,10 +5,27 @@ Inspired by Clawdbot's session persistence pattern.
 """
 
 import json
-from datetime import datetime
+import os
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+# Session files are read backwards in blocks of this many bytes
+READ_CHUNK_SIZE = 65536
+
+
+def _parse_entry(line: bytes) -> dict[str, Any] | None:
+    """Decode one JSONL line; None for blank or malformed lines."""
+    if not line.strip():
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:  # JSONDecodeError, or a cut UTF-8 sequence
+        return None
+    return entry if isinstance(entry, dict) else None
+
 
 class SessionStore:
     """Persistent session storage in JSONL format.
@@ -51,20 +68,9 @@ class SessionStore:
         Returns:
             List of session entries, most recent last
         """
-        path = self._get_session_file(user_id)
-        if not path.exists():
-            return []
-
-        entries = []
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue  # Skip malformed lines
-
-        return entries[-limit:]
+        entries = list(islice(self._iter_newest_first(user_id), limit))
+        entries.reverse()
+        return entries
 
     def get_today(self, user_id: int) -> list[dict]:
         """Get today's session entries.
@@ -76,11 +82,51 @@ class SessionStore:
             List of today's entries
         """
         today = datetime.now().date().isoformat()
-        return [
-            e
-            for e in self.get_recent(user_id, limit=200)
-            if e.get("ts", "").startswith(today)
-        ]
+        entries = []
+        # Entries are chronological: stop at the first one dated before today
+        for e in islice(self._iter_newest_first(user_id), 200):
+            try:
+                day = datetime.fromisoformat(e["ts"]).date().isoformat()
+            except (KeyError, TypeError, ValueError):
+                continue  # Skip entries without a usable timestamp
+            if day < today:
+                break
+            if day == today:
+                entries.append(e)
+        entries.reverse()
+        return entries
+
+    def _iter_newest_first(self, user_id: int) -> Iterator[dict[str, Any]]:
+        """Yield parsed session entries from the newest back.
+
+        The file is read backwards in blocks, so only the lines actually
+        consumed are read and parsed, not the whole history.
+        """
+        path = self._get_session_file(user_id)
+        try:
+            f = path.open("rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            # Start of the block read last; it may continue in the next one
+            head = b""
+            while pos > 0:
+                step = min(READ_CHUNK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                # Split on the byte, not splitlines(): texts may contain raw
+                # U+2028, and b"\n" never occurs inside a UTF-8 sequence
+                lines = (f.read(step) + head).split(b"\n")
+                head = lines[0]
+                for line in reversed(lines[1:]):
+                    entry = _parse_entry(line)
+                    if entry is not None:
+                        yield entry
+            entry = _parse_entry(head)
+            if entry is not None:
+                yield entry
 
     def get_stats(self, user_id: int, days: int = 7) -> dict[str, int]:
         """Get usage statistics for the last N days.
@@ -92,8 +138,6 @@ class SessionStore:
         Returns:
             Dict with counts by entry type
         """
-        from datetime import timedelta
-
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         entries = self.get_recent(user_id, limit=1000)
 